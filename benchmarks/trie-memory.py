@@ -0,0 +1,43 @@
+'''
+Compare the memory used by Trie, FrozenTrie and DAWG when loaded with the corpora.
+Run from this directory: python trie-memory.py
+'''
+import os
+import sys
+import time
+import tracemalloc
+
+here = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.normpath(os.path.join(here, "../src")))
+
+from trie import Trie, FrozenTrie, DAWG
+
+def load(corpus):
+	with open(os.path.join(here, "../corpora", corpus), "r") as f:
+		return [line.rstrip() for line in f]
+
+def measure(build):
+	tracemalloc.start()
+	start = time.time()
+	result = build()
+	elapsed = time.time() - start
+	size = tracemalloc.get_traced_memory()[0]
+	tracemalloc.stop()
+	return result, size, elapsed
+
+def main():
+	for corpus in ["english-corpus.txt", "maori-corpus.txt"]:
+		words = load(corpus)
+		raw = sum([sys.getsizeof(word) for word in words])
+		trie, trie_size, trie_time = measure(lambda : Trie(words))
+		frozen, frozen_size, frozen_time = measure(lambda : trie.freeze())
+		dawg, dawg_size, dawg_time = measure(lambda : DAWG(words))
+		print("=================")
+		print(corpus + ": " + str(len(trie)) + " words, " + str(raw // 1024) + " KB as str objects")
+		print("Trie:       " + str(trie_size // 1024) + " KB (built in " + str(round(trie_time, 2)) + "s)")
+		print("FrozenTrie: " + str(frozen_size // 1024) + " KB (frozen in " + str(round(frozen_time, 2)) + "s, arrays " + str(frozen.nbytes() // 1024) + " KB)")
+		print("DAWG:       " + str(dawg_size // 1024) + " KB (built in " + str(round(dawg_time, 2)) + "s, arrays " + str(dawg.nbytes() // 1024) + " KB, " + str(dawg.nodes()) + " nodes)")
+	print("=================")
+
+if __name__ == "__main__":
+	main()
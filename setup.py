@@ -8,6 +8,7 @@ setup(
 	version = "0.0.1",
 	author = "craigthelinguist",
 	description = "Utilities for natural language processing.",
-	packages=["src/classifiers", "src/ling", "src/trie"]
+	packages=["src/classifiers", "src/ling", "src/trie"],
+	install_requires=["numpy"]
 
 )
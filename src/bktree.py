@@ -0,0 +1,170 @@
+import ling as __ling__
+import heapq as __heapq__
+import pickle as __pickle__
+
+class BKTree(object):
+	'''
+	A BK-tree (Burkhard-Keller tree) of words, for finding the words within some edit distance of a string.
+
+	Each child of a node is filed under its distance from that node. By the triangle inequality, a word within k of
+	the query can only sit under a child whose key is within k of the query's distance to the node, so most of the
+	tree is never compared with the query.
+
+	Nodes are kept in flat lists rather than linked objects, so big trees pickle without hitting the recursion limit.
+
+	Keyword Arguments:
+	------------------
+		words : Iterable
+			collection of words to put into the tree, e.g.: the lines of a corpus.
+			(default=[])
+		case_sensitive : bool
+			whether uppercase and lowercase chars should be considered the same, as for ling.levenshtein
+			(default=False)
+		metric : function
+			distance between two strings. Must be a metric (obey the triangle inequality) with int values, and must
+			be defined at module level for the tree to be pickled.
+			(default=None, Levenshtein distance)
+	'''
+
+	def __init__(self, words=[], case_sensitive=False, metric=None):
+		self.case_sensitive = case_sensitive
+		self.metric = metric
+		self.words = []
+		self.children = []
+		for word in words:
+			self.add(word)
+
+	def __len__(self):
+		return len(self.words)
+
+	def __iter__(self):
+		return iter(self.words)
+
+	def __contains__(self, word):
+		return len(self.within(word, 0)) > 0
+
+	def __distance__(self, word1, word2):
+		if self.metric != None:
+			return self.metric(word1, word2)
+		# with unit costs and a bound nothing can exceed, ling.levenshtein uses its bit-parallel kernel
+		return __ling__.levenshtein(word1, word2, self.case_sensitive, max_distance=len(word1) + len(word2))
+
+	def add(self, word):
+		'''
+		Add a word to this tree.
+		Return bool : whether the word was added or not.
+
+		Parameters:
+		-----------
+			word : str
+				word to be added to the tree.
+		'''
+		if len(self.words) == 0:
+			self.words.append(word)
+			self.children.append({})
+			return True
+		node = 0
+		while True:
+			distance = self.__distance__(word, self.words[node])
+			if distance == 0:
+				return False
+			kids = self.children[node]
+			if distance not in kids:
+				kids[distance] = len(self.words)
+				self.words.append(word)
+				self.children.append({})
+				return True
+			node = kids[distance]
+
+	def within(self, query, k):
+		'''
+		Find every word within distance k of the query.
+		Return: list of (str, int), closest first.
+
+		Parameters:
+		-----------
+			query : str
+				string to look up
+			k : int
+				maximum distance
+		'''
+		if len(self.words) == 0:
+			return []
+		matches = []
+		stack = [0]
+		while len(stack) > 0:
+			node = stack.pop()
+			distance = self.__distance__(query, self.words[node])
+			if distance <= k:
+				matches.append((self.words[node], distance))
+			for key, child in self.children[node].items():
+				if distance - k <= key <= distance + k:
+					stack.append(child)
+		matches.sort(key=lambda pair : (pair[1], pair[0]))
+		return matches
+
+	def nearest(self, query, n=1):
+		'''
+		Find the n words closest to the query. Ties at the furthest distance are broken arbitrarily.
+		Return: list of (str, int), closest first.
+
+		Parameters:
+		-----------
+			query : str
+				string to look up
+			n : int
+				how many words to return
+				(default=1)
+		'''
+		if len(self.words) == 0 or n < 1:
+			return []
+
+		# best holds the n closest so far as (-distance, -node), so best[0] is the furthest of them
+		best = []
+		stack = [0]
+		while len(stack) > 0:
+			node = stack.pop()
+			distance = self.__distance__(query, self.words[node])
+			if len(best) < n:
+				__heapq__.heappush(best, (-distance, -node))
+			elif distance < -best[0][0]:
+				__heapq__.heapreplace(best, (-distance, -node))
+
+			# only look under children that could hold something closer than the furthest we've kept
+			radius = -best[0][0] if len(best) == n else None
+			for key, child in self.children[node].items():
+				if radius == None or abs(key - distance) < radius:
+					stack.append(child)
+
+		matches = [(self.words[-node], -distance) for distance, node in best]
+		matches.sort(key=lambda pair : (pair[1], pair[0]))
+		return matches
+
+	def save(self, path):
+		'''
+		Save this tree to a file, so it can be loaded without rebuilding it.
+
+		Parameters:
+		-----------
+			path : str
+				file to write to
+		'''
+		with open(path, "wb") as f:
+			__pickle__.dump(self, f, protocol=__pickle__.HIGHEST_PROTOCOL)
+
+	@staticmethod
+	def load(path):
+		'''
+		Load a tree saved with BKTree.save.
+		Return: BKTree
+
+		Parameters:
+		-----------
+			path : str
+				file to read from
+		'''
+		with open(path, "rb") as f:
+			tree = __pickle__.load(f)
+		if not isinstance(tree, BKTree):
+			raise TypeError("File did not contain a BKTree.")
+		return tree
@@ -1,7 +1,80 @@
 
-from collections import Iterable
+from collections import Iterable, OrderedDict
 from functools import reduce
 import numbers as __numbers__
+import numpy as __np__
+import ling as __ling__
+
+# version of the files written by the matchers' and LanguageClassifier's save methods.
+# 2 added MarkovMatcher, and the kind of each matcher in a saved LanguageClassifier.
+__MODEL_FORMAT__ = 2
+
+def __checkformat__(data, kind):
+	'''
+	Check that a loaded .npz file is a saved model of the given kind, in a format we can read.
+	'''
+	if "format" not in data or "kind" not in data:
+		raise ValueError("Not a saved model file.")
+	if str(data["kind"]) != kind:
+		raise ValueError("Expected a saved " + kind + " but found a saved " + str(data["kind"]) + ".")
+	if int(data["format"]) > __MODEL_FORMAT__:
+		raise ValueError("Saved model has format version " + str(int(data["format"])) + ", but only versions up to " + str(__MODEL_FORMAT__) + " are supported.")
+
+class __TokenCache__():
+	'''
+	A bounded cache of scores keyed by token, which throws away the least recently used token when it's full.
+	It remembers which generation of a model its scores came from, and empties itself when asked about another one.
+
+	Parameters
+	----------
+		capacity : int
+			how many tokens to remember
+	'''
+
+	def __init__(self, capacity):
+		if not isinstance(capacity, int) or capacity < 1:
+			raise ValueError("Cache capacity must be a positive int.")
+		self.capacity = capacity
+		self.hits = 0
+		self.misses = 0
+		self.evictions = 0
+		self.__entries__ = OrderedDict()
+		self.__generation__ = None
+
+	def lookup(self, tokens, generation, score):
+		'''
+		Return the scores of the given tokens. The ones that aren't cached are scored with one call to score, which takes
+		a list of tokens and returns a list of their scores.
+		'''
+		if generation != self.__generation__:
+			self.__entries__.clear()
+			self.__generation__ = generation
+		results = [None] * len(tokens)
+		pending = OrderedDict()
+		for i, token in enumerate(tokens):
+			if token in self.__entries__:
+				self.__entries__.move_to_end(token)
+				results[i] = self.__entries__[token]
+				self.hits = self.hits + 1
+			elif token in pending:
+				pending[token].append(i)
+				self.hits = self.hits + 1
+			else:
+				pending[token] = [i]
+				self.misses = self.misses + 1
+		if len(pending) > 0:
+			missing = list(pending.keys())
+			for token, value in zip(missing, score(missing)):
+				for i in pending[token]:
+					results[i] = value
+				self.__entries__[token] = value
+				if len(self.__entries__) > self.capacity:
+					self.__entries__.popitem(last=False)
+					self.evictions = self.evictions + 1
+		return results
+
+	def stats(self):
+		return { "hits" : self.hits, "misses" : self.misses, "evictions" : self.evictions, "size" : len(self.__entries__), "capacity" : self.capacity }
 
 
 class AbstractClassifier():
@@ -27,6 +100,10 @@ class AbstractMatcher():
 	'''
 
 	__inverted__ = False
+	__cache__ = None
+
+	# bumped whenever the matcher learns something, so cached scores from before can be thrown away
+	__generation__ = 0
 
 	def match_word(self, words):
 		raise NotImplementedError()
@@ -40,10 +117,136 @@ class AbstractMatcher():
 	def is_inverted(self):
 		return self.__inverted__
 
+	def use_cache(self, capacity):
+		'''
+		Remember the scores of up to capacity recently seen tokens, so scoring the same token again is a dictionary lookup.
+		The cache is emptied whenever the matcher is trained. Pass None to stop caching.
+
+		Parameters
+		----------
+			capacity : int or None
+				how many tokens to remember
+		'''
+		self.__cache__ = None if capacity == None else __TokenCache__(capacity)
+
+	def cache_stats(self):
+		'''
+		Return how many cache lookups hit and missed, how many tokens were evicted, and how full the cache is, or None if there's no cache.
+		'''
+		return None if self.__cache__ == None else self.__cache__.stats()
+
+	def __cachedvals__(self, strings):
+		'''
+		Score strings with __matchvals__, going through the cache if there is one.
+		'''
+		if self.__cache__ == None:
+			return self.__matchvals__(strings)
+		return self.__cache__.lookup(strings, self.__generation__, self.__matchvals__)
+
+
+
+
+class __BatchMatcher__(AbstractMatcher):
+	'''
+	Base for matchers that score many strings at once with __matchvals__, which takes a list of strings and returns a list of
+	probabilities. Matching is built on top of that, and saving and loading on __arrays__ and __fromarrays__.
+	'''
+
+	# how many strings, and how many characters once they're padded to the same length, one array operation may hold
+	__BATCH__ = 1 << 16
+	__CELLS__ = 1 << 20
+
+	# fewer strings than this are scored one at a time by __matchone__, which is quicker than setting up arrays
+	__SMALL__ = 8
+
+	def __batches__(self, strings):
+		'''
+		Split strings into batches for array operations. Each batch holds strings of similar length, and is capped at
+		__CELLS__ characters once they're padded to the longest, so one long string doesn't inflate the others.
+		A string longer than __CELLS__ gets a batch to itself.
+		Yields lists of positions in strings.
+		'''
+		batch = []
+		for i in sorted(range(len(strings)), key=lambda i : len(strings[i])):
+			if len(batch) == self.__BATCH__ or (len(batch) > 0 and (len(batch) + 1) * len(strings[i]) > self.__CELLS__):
+				yield batch
+				batch = []
+			batch.append(i)
+		if len(batch) > 0:
+			yield batch
+
+	def __matchvals__(self, strings):
+		'''
+		Score many strings at once, in batches of similar length scored by __matchbatch__. A handful of strings are scored
+		one at a time by __matchone__ instead.
+		'''
+		strings = [string.lower() for string in strings]
+		if len(strings) < self.__SMALL__:
+			return [self.__matchone__(string) for string in strings]
+		scores = __np__.zeros(len(strings), dtype=__np__.float64)
+		for positions in self.__batches__(strings):
+			scores[positions] = self.__matchbatch__([strings[i] for i in positions])
+		return scores.tolist()
+
+	def save(self, path):
+		'''
+		Save this matcher to a file in numpy's .npz format.
+
+		Parameters
+		----------
+		path : str
+			file to write to
+		'''
+		with open(path, "wb") as f:
+			__np__.savez(f, format=__np__.int64(__MODEL_FORMAT__), kind=__np__.str_(type(self).__name__), **self.__arrays__())
+
+	@classmethod
+	def load(cls, path):
+		'''
+		Load a matcher saved with save.
+		Return: a matcher of the class load was called on
+
+		Parameters
+		----------
+		path : str
+			file to read from
+		'''
+		with __np__.load(path, allow_pickle=False) as data:
+			__checkformat__(data, cls.__name__)
+			return cls.__fromarrays__(data)
+
+	def match_probability(self, strings):
+		if isinstance(strings, str):
+			return self.__cachedvals__([strings])[0]
+		elif isinstance(strings, Iterable):
+			return self.__cachedvals__(list(strings))
+		else:
+			raise TypeError("Can only match str or Iterable.")
+
+	def match_word(self, strings):
+		prob = self.match_probability(strings)
+		return (prob >= self.__threshold__) != self.__inverted__
+
+	def match_text(self, strings, split=None):
+		prob = self.match_text_probability(strings, split)
+		return (prob >= self.__threshold__) != self.__inverted__
+
+	def match_text_probability(self, strings, split=None):
+		if split != None:
+			strings = strings.split(split)
+		strings = list(strings)
+		matched = 0
+		for prob in self.match_probability(strings):
+			if (prob >= self.__threshold__) != self.__inverted__:
+				matched = matched + 1
+		return 1.0 * matched / len(strings)
+
+
 
 
 
-class CorpusMatcher(AbstractMatcher):
+
+class CorpusMatcher(__BatchMatcher__):
 	'''
 	CorpusMatcher will match strings based on their likeness to a corpus of words. It does this by counting the frequency that one character will follow another in a
 	specified corpus and use this to figure out the probability that any arbitrary string matches the corpus of words. It can also match "true" or "false" depending on
@@ -56,93 +259,437 @@ class CorpusMatcher(AbstractMatcher):
 			being part of the corpus is 60% or greater
 		trainingSet : Iterable
 			a collection of strings. Their character frequencies will be uesd as the basis for CorpusMatcher's probability matching.
+		decay : float between 0.0 and 1.0
+			if given, the counts so far are multiplied by decay each time partial_fit is called, so older data gradually
+			matters less than newer data.
+		cache : int
+			if given, remember the scores of this many recently seen tokens. See use_cache.
 	'''
 
-	def __init__(self, threshold, trainingSet=[]):
+	# the transition matrix as nested lists, with the matrix they came from. See __rows__.
+	__listed__ = None
+
+	def __init__(self, threshold, trainingSet=[], decay=None, cache=None):
 		if not isinstance(threshold, float) or threshold < 0 or threshold > 1:
 			raise TypeError("Threshold must be a float between 0 and 1.")
 		if not isinstance(trainingSet, Iterable):
 			raise TypeError("CorpusMatcher trainingSet must be Iterable.")
+		if decay != None and (decay <= 0 or decay > 1):
+			raise ValueError("Decay must be between 0 and 1.")
 		self.__trainingSet__ = trainingSet
 		self.__threshold__ = threshold
+		self.__decay__ = decay
+		self.use_cache(cache)
 		self.train(trainingSet)
 
+	def __encode__(self, strings):
+		'''
+		Encode strings as a padded array of alphabet indices. Padding, and characters that weren't in the
+		training set, get the index of the all-zero last row and column of the transition matrix.
+		'''
+		codes, lengths = __ling__.__encode_padded__(strings)
+		unknown = len(self.__lookup__) - 1
+		codes[codes < 0] = unknown
+		return self.__lookup__[__np__.minimum(codes, unknown)], lengths
+
 	def __getvalue__(self, c1, c2):
-		if c1 not in self.__frequencies__:
-			return 0
-		elif c2 not in self.__frequencies__[c1]:
-			return 0
-		else:
-			return self.__frequencies__[c1][c2]
+		indices, lengths = self.__encode__([c1 + c2])
+		return float(self.__transitions__()[indices[0,0], indices[0,1]])
+
+	def __transitions__(self):
+		'''
+		Return the transition matrix, normalising the raw counts if they've changed since it was last needed.
+		The matrix has an extra all-zero last row and column for characters that aren't in the alphabet.
+		'''
+		if self.__matrix__ is None:
+			size = len(self.__alphabet__)
+			totals = self.__counts__.sum(axis=1)
+			matrix = __np__.zeros((size + 1, size + 1), dtype=__np__.float64)
+			matrix[:size,:size] = self.__counts__ / __np__.where(totals > 0, totals, 1)[:,None]
+			self.__matrix__ = matrix
+		return self.__matrix__
+
+	def __extend__(self, chars):
+		'''
+		Add any new characters to the end of the alphabet, so existing indices stay the same.
+		'''
+		new = sorted(set(chars) - set(self.__positions__.keys()))
+		if len(new) == 0:
+			return
+		for char in new:
+			self.__positions__[char] = len(self.__alphabet__)
+			self.__alphabet__.append(char)
+		size = len(self.__alphabet__)
+		counts = __np__.zeros((size, size), dtype=__np__.float64)
+		old = self.__counts__.shape[0]
+		counts[:old,:old] = self.__counts__
+		self.__counts__ = counts
+		self.__reindex__()
+
+	def __reindex__(self):
+		'''
+		Map code points to alphabet indices. The last entry catches everything else.
+		'''
+		size = len(self.__alphabet__)
+		top = max([ord(char) for char in self.__alphabet__] + [-1])
+		lookup = __np__.full(top + 2, size, dtype=__np__.int64)
+		for char in self.__alphabet__:
+			lookup[ord(char)] = self.__positions__[char]
+		self.__lookup__ = lookup
+
+	def __rows__(self):
+		'''
+		Return the transition matrix as nested lists, which are quicker than the array to read one value at a time.
+		'''
+		matrix = self.__transitions__()
+		if self.__listed__ == None or self.__listed__[0] is not matrix:
+			self.__listed__ = (matrix, matrix.tolist())
+		return self.__listed__[1]
 
-	def __matchval__(self, string):
-		string = string.lower()
+	def __matchone__(self, string):
+		'''
+		Score one lowercased string, without any arrays.
+		'''
 		if len(string) == 0:
-			return 0
-		if len(string) == 1:
-			return 1 if string[0] in self.__frequencies__ else 0
-		sum_value = 0
-		for i in range(len(string)-1):
-			c1 = string[i]
-			c2 = string[i+1]
-			val = self.__getvalue__(c1,c2)
-			sum_value = sum_value + val
-		return 1.0 * sum_value / (len(string)-1)
+			return 0.0
+		rows = self.__rows__()
+		unknown = len(self.__alphabet__)
+		indices = [self.__positions__.get(char, unknown) for char in string]
+
+		# a single character matches if it was ever followed by anything
+		if len(indices) == 1:
+			return 1.0 if sum(rows[indices[0]]) > 0 else 0.0
+		total = 0.0
+		for i in range(len(indices) - 1):
+			total = total + rows[indices[i]][indices[i+1]]
+		return total / (len(indices) - 1)
+
+	def __matchbatch__(self, strings):
+		'''
+		Score a batch of lowercased strings: look up the probability of every character pair in the transition matrix
+		with one gather, and average over each string's pairs. Pairs involving padding score 0 so they don't
+		need masking, they're just left out of the average.
+		'''
+		matrix = self.__transitions__()
+		indices, lengths = self.__encode__(strings)
+		values = __np__.zeros(len(strings), dtype=__np__.float64)
+		if indices.shape[1] == 0:
+			return values
+		if indices.shape[1] > 1:
+			sums = matrix[indices[:,:-1], indices[:,1:]].sum(axis=1)
+			pairs = __np__.maximum(lengths - 1, 1)
+			values = __np__.where(lengths > 1, sums / pairs, 0.0)
+
+		# a single character matches if it was ever followed by anything
+		seen = matrix.sum(axis=1) > 0
+		return __np__.where(lengths == 1, seen[indices[:,0]].astype(__np__.float64), values)
 
 	def train(self, trainingSet):
-		frequencies = {}
+		'''
+		Throw away everything learned so far, and learn from the given training set.
+
+		Parameters
+		----------
+			trainingSet : Iterable
+				a collection of strings
+		'''
+		self.__alphabet__ = []
+		self.__positions__ = {}
+		self.__counts__ = __np__.zeros((0, 0), dtype=__np__.float64)
+		self.__lookup__ = __np__.zeros(1, dtype=__np__.int64)
+		self.__matrix__ = None
+		self.__count__(trainingSet)
+
+	def partial_fit(self, words):
+		'''
+		Learn from some more words, on top of everything learned so far. If this matcher has a decay, the counts
+		so far are multiplied by it first.
+
+		Parameters
+		----------
+			words : Iterable
+				a collection of strings
+		'''
+		if self.__decay__ != None:
+			self.__counts__ *= self.__decay__
+		self.__count__(words)
+
+	def merge(self, other):
+		'''
+		Add the counts learned by another CorpusMatcher to this one, e.g.: one trained on another shard of the corpus.
 
-		# helper method
-		def insert(c1, c2):
+		Parameters
+		----------
+			other : CorpusMatcher
+				the matcher whose counts to add
+		'''
+		if not isinstance(other, CorpusMatcher):
+			raise TypeError("Can only merge with another CorpusMatcher.")
+		self.__extend__(other.__alphabet__)
+		indices = [self.__positions__[char] for char in other.__alphabet__]
+		self.__counts__[__np__.ix_(indices, indices)] += other.__counts__
+		self.__matrix__ = None
+		self.__generation__ = self.__generation__ + 1
+
+	def counts(self):
+		'''
+		Return the raw counts: a mapping of each character to a mapping of the characters that followed it to how often they did.
+		'''
+		frequencies = {}
+		for i, j in zip(*__np__.nonzero(self.__counts__)):
+			c1 = self.__alphabet__[i]
 			if c1 not in frequencies:
 				frequencies[c1] = {}
-			if c2 not in frequencies[c1]:
-				frequencies[c1][c2] = 1
-			else:
-				frequencies[c1][c2] = frequencies[c1][c2] + 1
-
-		# get word count
-		for word in trainingSet:
-			for i in range(len(word)-1):
-				c1 = word[i]
-				c2 = word[i+1]
-				insert(c1,c2)
-
-		# normalise
-		for char in frequencies:
-			fmap = frequencies[char]
-			total = sum(fmap.values())
-			for successor in fmap:
-				value = fmap[successor]
-				normed = value * 1.0 / total
-				fmap[successor] = normed
-
-		self.__frequencies__ = frequencies
+			frequencies[c1][self.__alphabet__[j]] = float(self.__counts__[i,j])
+		return frequencies
 
-	def match_probability(self, strings):
-		if isinstance(strings, str):
-			return self.__matchval__(strings)
-		elif isinstance(strings, Iterable):
-			return [self.__matchval__(s) for s in strings]
-		else:
-			raise TypeError("Can only match str or Iterable.")
-    
-	def match_word(self, strings):
-		prob = self.match_probability(strings)
-		return (prob >= self.__threshold__) != self.__inverted__
+	def __count__(self, words):
+		'''
+		Count how often each character follows each other character in the given words, and add it to the raw counts.
+		'''
+		words = [word for word in words]
+		self.__extend__("".join(words))
+		size = len(self.__alphabet__)
+
+		# get word count. Pairs with padding land in the last row or column, which is dropped.
+		for positions in self.__batches__(words):
+			indices, lengths = self.__encode__([words[i] for i in positions])
+			if indices.shape[1] > 1:
+				pairs = indices[:,:-1] * (size + 1) + indices[:,1:]
+				counts = __np__.bincount(pairs.ravel(), minlength=(size + 1) ** 2).reshape((size + 1, size + 1))
+				self.__counts__ += counts[:size,:size]
+		self.__matrix__ = None
+		self.__generation__ = self.__generation__ + 1
+
+	def __arrays__(self, prefix=""):
+		'''
+		Everything needed to rebuild this matcher, as a dict of arrays for numpy.savez.
+		'''
+		return {
+			prefix + "alphabet" : __np__.array(self.__alphabet__, dtype=__np__.str_),
+			prefix + "counts" : self.__counts__,
+			prefix + "matrix" : self.__transitions__(),
+			prefix + "threshold" : __np__.float64(self.__threshold__),
+			prefix + "inverted" : __np__.bool_(self.__inverted__),
+			prefix + "decay" : __np__.float64(__np__.nan if self.__decay__ == None else self.__decay__)
+		}
+
+	@staticmethod
+	def __fromarrays__(data, prefix=""):
+		'''
+		Rebuild a matcher from the arrays written by __arrays__, without retraining.
+		'''
+		matcher = CorpusMatcher.__new__(CorpusMatcher)
+		matcher.__trainingSet__ = []
+		matcher.__threshold__ = float(data[prefix + "threshold"])
+		decay = float(data[prefix + "decay"])
+		matcher.__decay__ = None if __np__.isnan(decay) else decay
+		if bool(data[prefix + "inverted"]):
+			matcher.__inverted__ = True
+		matcher.__alphabet__ = [str(char) for char in data[prefix + "alphabet"]]
+		matcher.__positions__ = dict([(char, i) for i, char in enumerate(matcher.__alphabet__)])
+		matcher.__counts__ = data[prefix + "counts"]
+		matcher.__matrix__ = data[prefix + "matrix"]
+		matcher.__reindex__()
+		return matcher
 
-	def match_text(self, strings, split=None):
-		prob = self.match_text_probability(strings, split)
-		return (prob >= self.__threshold__) != self.__inverted__
 
-	def match_text_probability(self, strings, split=None):
-		if split != None:
-			strings = strings.split(split)
-		matched = 0
-		for s in strings:
-			if self.match_word(s):
-				matched = matched + 1
-		return 1.0 * matched / len(strings)
+
+
+
+
+class MarkovMatcher(__BatchMatcher__):
+	'''
+	MarkovMatcher matches strings like CorpusMatcher, but predicts each character from up to order - 1 characters before it instead of just one.
+	When a character was never seen after its full context, it backs off to shorter and shorter contexts, scaling the probability down by backoff
+	each time. The counts are kept in a fixed-size hashed table, so memory use doesn't grow with the corpus: once the table is full, unrelated
+	n-grams start sharing counts, which costs a little accuracy rather than more memory.
+
+	An order of 2 scores strings the same way CorpusMatcher does, apart from those hash collisions.
+
+	Parameters
+	----------
+		threshold : float between 0.0 and 1.0
+			how probable a string's inclusion has to be before it is matched.
+		trainingSet : Iterable
+			a collection of strings, whose character n-grams will be used as the basis for MarkovMatcher's probability matching.
+		order : int
+			the length of the n-grams counted. 2 counts character pairs, 3 counts trigrams and so on.
+		memory : int
+			roughly how many bytes the count table may use. It's rounded down to a power of two.
+		backoff : float between 0.0 and 1.0
+			how much a probability is scaled down each time it has to back off to a shorter context.
+		cache : int
+			if given, remember the scores of this many recently seen tokens. See use_cache.
+	'''
+
+	# multiplier for the rolling hash of a context, and tags to tell contexts and n-grams apart
+	__PRIME__ = __np__.uint64(0x100000001b3)
+	__CONTEXT__ = __np__.uint64(0x9e3779b97f4a7c15)
+	__NGRAM__ = __np__.uint64(0xc2b2ae3d27d4eb4f)
+
+	def __init__(self, threshold, trainingSet=[], order=3, memory=1<<22, backoff=0.4, cache=None):
+		if not isinstance(threshold, float) or threshold < 0 or threshold > 1:
+			raise TypeError("Threshold must be a float between 0 and 1.")
+		if not isinstance(trainingSet, Iterable):
+			raise TypeError("MarkovMatcher trainingSet must be Iterable.")
+		if not isinstance(order, int) or order < 2:
+			raise ValueError("Order must be an int of at least 2.")
+		if memory < 4:
+			raise ValueError("Memory must be at least 4 bytes.")
+		if backoff < 0 or backoff > 1:
+			raise ValueError("Backoff must be between 0 and 1.")
+		self.__threshold__ = threshold
+		self.__order__ = order
+		self.__backoff__ = backoff
+		self.__size__ = 1 << ((memory // 4).bit_length() - 1)
+		self.use_cache(cache)
+		self.train(trainingSet)
+
+	@staticmethod
+	def __mix__(hashes, tag):
+		'''
+		Scramble an array of hashes (the splitmix64 finaliser), so nearby values land in unrelated slots.
+		'''
+		x = hashes ^ tag
+		x = (x ^ (x >> __np__.uint64(30))) * __np__.uint64(0xbf58476d1ce4e5b9)
+		x = (x ^ (x >> __np__.uint64(27))) * __np__.uint64(0x94d049bb133111eb)
+		return x ^ (x >> __np__.uint64(31))
+
+	def __hashed__(self, strings):
+		'''
+		Hash strings into the count table.
+		Yields, for each context length n from 1 to order - 1: the table slots of the context before each character,
+		the table slots of that context followed by the character, and which positions have a full context of length n.
+		'''
+		codes, lengths = __ling__.__encode_padded__(strings)
+		symbols = (codes + 1).astype(__np__.uint64)
+		positions = __np__.arange(codes.shape[1])
+		mask = __np__.uint64(self.__size__ - 1)
+		hashes = __np__.zeros(codes.shape, dtype=__np__.uint64)
+		for n in range(1, self.__order__):
+			if n >= codes.shape[1]:
+				break
+			shifted = __np__.zeros(codes.shape, dtype=__np__.uint64)
+			shifted[:,n:] = symbols[:,:-n]
+			hashes = hashes * MarkovMatcher.__PRIME__ + shifted
+			contexts = MarkovMatcher.__mix__(hashes, MarkovMatcher.__CONTEXT__) & mask
+			ngrams = MarkovMatcher.__mix__(hashes * MarkovMatcher.__PRIME__ + symbols, MarkovMatcher.__NGRAM__) & mask
+			valid = (positions[None,:] >= n) & (positions[None,:] < lengths[:,None])
+			yield contexts.astype(__np__.int64), ngrams.astype(__np__.int64), valid
+
+	def train(self, trainingSet):
+		'''
+		Throw away everything learned so far, and learn from the given training set.
+
+		Parameters
+		----------
+			trainingSet : Iterable
+				a collection of strings
+		'''
+		self.__table__ = __np__.zeros(self.__size__, dtype=__np__.uint32)
+		self.partial_fit(trainingSet)
+
+	def partial_fit(self, words):
+		'''
+		Learn from some more words, on top of everything learned so far.
+
+		Parameters
+		----------
+			words : Iterable
+				a collection of strings
+		'''
+		words = [word for word in words]
+		for positions in self.__batches__(words):
+			for contexts, ngrams, valid in self.__hashed__([words[i] for i in positions]):
+				slots = __np__.concatenate([contexts[valid], ngrams[valid]])
+				self.__table__ += __np__.bincount(slots, minlength=self.__size__).astype(__np__.uint32)
+		self.__generation__ = self.__generation__ + 1
+
+	def merge(self, other):
+		'''
+		Add the counts learned by another MarkovMatcher to this one. Both must have the same order and table size.
+
+		Parameters
+		----------
+			other : MarkovMatcher
+				the matcher whose counts to add
+		'''
+		if not isinstance(other, MarkovMatcher):
+			raise TypeError("Can only merge with another MarkovMatcher.")
+		if other.__order__ != self.__order__ or other.__size__ != self.__size__:
+			raise ValueError("Can only merge MarkovMatchers with the same order and memory.")
+		self.__table__ += other.__table__
+		self.__generation__ = self.__generation__ + 1
+
+	def __matchone__(self, string):
+		return float(self.__matchbatch__([string])[0])
+
+	def __matchbatch__(self, strings):
+		'''
+		Score a batch of lowercased strings. Every context length is looked up for every position with one gather per length,
+		then each position takes the longest context under which its character was seen, and each string's score
+		is the average over its positions.
+		'''
+		codes, lengths = __ling__.__encode_padded__(strings)
+		if codes.shape[1] == 0:
+			return __np__.zeros(len(strings), dtype=__np__.float64)
+		probabilities = __np__.zeros(codes.shape, dtype=__np__.float64)
+		found = __np__.zeros(codes.shape, dtype=bool)
+		levels = list(self.__hashed__(strings))
+
+		# the longest context each position could have, which is what backing off is counted from
+		longest = __np__.minimum(self.__order__ - 1, __np__.arange(codes.shape[1]))[None,:]
+		for n in range(len(levels), 0, -1):
+			contexts, ngrams, valid = levels[n-1]
+			context_counts = self.__table__[contexts].astype(__np__.float64)
+			ngram_counts = self.__table__[ngrams].astype(__np__.float64)
+			hit = valid & ~found & (ngram_counts > 0) & (context_counts > 0)
+			scale = self.__backoff__ ** __np__.maximum(longest - n, 0).astype(__np__.float64)
+			probabilities = __np__.where(hit, scale * __np__.minimum(ngram_counts / __np__.maximum(context_counts, 1), 1.0), probabilities)
+			found = found | hit
+		pairs = __np__.maximum(lengths - 1, 1)
+		values = __np__.where(lengths > 1, probabilities.sum(axis=1) / pairs, 0.0)
+
+		# a single character matches if it was ever followed by anything
+		symbols = (codes[:,0] + 1).astype(__np__.uint64)
+		first = MarkovMatcher.__mix__(symbols, MarkovMatcher.__CONTEXT__) & __np__.uint64(self.__size__ - 1)
+		seen = (self.__table__[first.astype(__np__.int64)] > 0).astype(__np__.float64)
+		return __np__.where(lengths == 1, seen, values)
+
+	def __arrays__(self, prefix=""):
+		'''
+		Everything needed to rebuild this matcher, as a dict of arrays for numpy.savez.
+		'''
+		return {
+			prefix + "table" : self.__table__,
+			prefix + "order" : __np__.int64(self.__order__),
+			prefix + "backoff" : __np__.float64(self.__backoff__),
+			prefix + "threshold" : __np__.float64(self.__threshold__),
+			prefix + "inverted" : __np__.bool_(self.__inverted__)
+		}
+
+	@staticmethod
+	def __fromarrays__(data, prefix=""):
+		'''
+		Rebuild a matcher from the arrays written by __arrays__, without retraining.
+		'''
+		matcher = MarkovMatcher.__new__(MarkovMatcher)
+		matcher.__threshold__ = float(data[prefix + "threshold"])
+		matcher.__order__ = int(data[prefix + "order"])
+		matcher.__backoff__ = float(data[prefix + "backoff"])
+		if bool(data[prefix + "inverted"]):
+			matcher.__inverted__ = True
+		matcher.__table__ = data[prefix + "table"]
+		matcher.__size__ = len(matcher.__table__)
+		return matcher
+
+
+
+
+
+# matchers that can be saved as part of a LanguageClassifier, by class name
+__SAVEABLE__ = { "CorpusMatcher" : CorpusMatcher, "MarkovMatcher" : MarkovMatcher }
 
 
 
@@ -315,17 +862,80 @@ class LanguageClassifier(AbstractClassifier):
 		matchers : {str -> AbstractMatcher}
 			a dict of matchers. The key is the name of the matcher. For example, you might have: {"Maori" : aMaoriMatcher, "English" : anEnglishMatcher}
 			and this LanguageClassifier would be capable of classifying text as either English or Maori, based on the given matchers.
+		cache : int
+			if given, remember the scores of this many recently seen words. See use_cache.
 	'''
 
 	__categories__ = {}
+	__cache__ = None
 
-	def __init__(self, matchers={}):
+	def __init__(self, matchers={}, cache=None):
 		if not isinstance(matchers, dict):
 			raise TypeError("Must pass dict to the matchers arg of LanguageClassifier, but was passed", type(matchers))
 		for matcher in matchers.values():
 			if not isinstance(matcher, AbstractMatcher):
 				raise TypeError("matchers arg of LanguageClassifier must be mapping of keys to AbstractMacther, but you passed a ", type(matcher))
 		self.__categories__ = matchers
+		self.use_cache(cache)
+
+	def use_cache(self, capacity):
+		'''
+		Remember how every category scored up to capacity recently seen words, so classifying the same word again is a dictionary lookup.
+		The cache is emptied whenever any of the matchers is trained. Pass None to stop caching.
+
+		Parameters
+		----------
+			capacity : int or None
+				how many words to remember
+		'''
+		self.__cache__ = None if capacity == None else __TokenCache__(capacity)
+
+	def cache_stats(self):
+		'''
+		Return how many cache lookups hit and missed, how many words were evicted, and how full the cache is, or None if there's no cache.
+		'''
+		return None if self.__cache__ == None else self.__cache__.stats()
+
+	def save(self, path):
+		'''
+		Save this classifier and all of its matchers to one file in numpy's .npz format. Only CorpusMatchers and MarkovMatchers can be saved.
+
+		Parameters
+		----------
+		path : str
+			file to write to
+		'''
+		names = sorted(self.__categories__.keys())
+		kinds = []
+		arrays = {}
+		for i, name in enumerate(names):
+			matcher = self.__categories__[name]
+			if type(matcher).__name__ not in __SAVEABLE__:
+				raise TypeError("Can only save a LanguageClassifier made of CorpusMatchers and MarkovMatchers, but " + name + " is a " + str(type(matcher)))
+			kinds.append(type(matcher).__name__)
+			arrays.update(matcher.__arrays__(str(i) + "/"))
+		with open(path, "wb") as f:
+			__np__.savez(f, format=__np__.int64(__MODEL_FORMAT__), kind=__np__.str_("LanguageClassifier"),
+				names=__np__.array(names, dtype=__np__.str_), kinds=__np__.array(kinds, dtype=__np__.str_), **arrays)
+
+	@staticmethod
+	def load(path):
+		'''
+		Load a classifier saved with LanguageClassifier.save.
+		Return: LanguageClassifier
+
+		Parameters
+		----------
+		path : str
+			file to read from
+		'''
+		with __np__.load(path, allow_pickle=False) as data:
+			__checkformat__(data, "LanguageClassifier")
+			names = [str(name) for name in data["names"]]
+			# files from before MarkovMatcher only hold CorpusMatchers
+			kinds = [str(kind) for kind in data["kinds"]] if "kinds" in data else ["CorpusMatcher"] * len(names)
+			matchers = dict([(name, __SAVEABLE__[kind].__fromarrays__(data, str(i) + "/")) for i, (name, kind) in enumerate(zip(names, kinds))])
+		return LanguageClassifier(matchers)
 
 	def classify_text(self, text, all_classifications=False):
 		'''
@@ -409,8 +1019,9 @@ class LanguageClassifier(AbstractClassifier):
 			raise TypeError("LanguageClassifier can only classify str or Itreable but was asked to classify ", type(strings))
 
 		wordmapping = {}
-		for word in strings:
-			probs = self.__getfmap__(word)
+		fmaps = self.__getfmaps__(strings)
+		for word in fmaps:
+			probs = fmaps[word]
 			if not all_classifications:
 				mostlikely = self.__getmostlikely__(probs)
 				wordmapping[word] = mostlikely
@@ -428,12 +1039,29 @@ class LanguageClassifier(AbstractClassifier):
 		E.g.: __getfmap__(word) ---> {"Maori" : 0.6, English : "0.2"}}}
 		Take a single string, return {"Maori" : 0.7, "English" : 0.4"}
 		'''
-		results = {}
-		for category in self.__categories__:
-			matcher = self.__categories__[category]
-			result = matcher.match_probability(string)
-			results[category] = result
-		return results
+		return self.__getfmaps__([string])[string]
+
+	def __getfmaps__(self, strings):
+		'''
+		Take many strings, return a mapping of each distinct string to its mapping of categories to score.
+		Each matcher scores all of the strings in one call to match_probability.
+		'''
+		unique = list(dict.fromkeys(strings))
+		if self.__cache__ == None:
+			fmaps = self.__scoremaps__(unique)
+		else:
+			# a matcher swapped for another, e.g.: a freshly loaded one, must empty the cache even at the same generation.
+			# The key holds the matchers themselves rather than their ids, so a replaced matcher's id can't be reused while it's cached.
+			generation = tuple([(category, matcher, matcher.__generation__) for category, matcher in self.__categories__.items()])
+			fmaps = self.__cache__.lookup(unique, generation, self.__scoremaps__)
+		return { word : dict(fmap) for word, fmap in zip(unique, fmaps) }
+
+	def __scoremaps__(self, strings):
+		'''
+		Take a list of distinct strings, return a list of their mappings of categories to score.
+		'''
+		scores = { category : self.__categories__[category].match_probability(strings) for category in self.__categories__ }
+		return [{ category : scores[category][i] for category in scores } for i in range(len(strings))]
 
 	def __getmostlikely__(self, probability_map):
 		'''
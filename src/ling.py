@@ -1,10 +1,151 @@
 from decimal import Decimal
 import math as __math__
+import itertools as __itertools__
 from collections import Iterable
+import numpy as __np__
 
-def get_ngram_alphabet(characters, degree):
+class NgramAlphabet(object):
 	'''
-	Given a collection of unigrams and a degree n, returns the set of all n-grams.
+	The set of all n-grams over a unigram alphabet, without materialising it.
+	N-grams are ordered as in get_ngram_alphabet: n-gram i is i written as a base-len(unigrams) number,
+	one digit per character, so index() and ngram() are O(degree) and agree with ngram_ids().
+	The number of n-grams is in size, which unlike len() works however many n-grams there are.
+	Slicing it returns a list of n-grams, as slicing the list from get_ngram_alphabet would.
+
+	Parameters
+	----------
+	characters : "alpha", "numeric", "alphanumeric", or Iterable
+		a collection of unique, single-character unigrams
+	degree : int >= 1
+		degree of the n-grams
+	'''
+
+	def __init__(self, characters, degree):
+		if degree < 1:
+			raise ValueError("Degree must be >= 1")
+		self.unigrams = list(__unigram_alphabet__(characters))
+		self.degree = degree
+		self.size = len(self.unigrams) ** degree
+		self.__positions__ = {}
+		for i, char in enumerate(self.unigrams):
+			if not isinstance(char, str) or len(char) != 1:
+				raise TypeError("NgramAlphabet unigrams must be single characters.")
+			if char in self.__positions__:
+				raise ValueError("NgramAlphabet unigrams must not contain duplicates.")
+			self.__positions__[char] = i
+
+	def __len__(self):
+		return self.size
+
+	def __bool__(self):
+		return self.size > 0
+
+	def __contains__(self, ngram):
+		if not isinstance(ngram, str) or len(ngram) != self.degree:
+			return False
+		for char in ngram:
+			if char not in self.__positions__:
+				return False
+		return True
+
+	def __iter__(self):
+		for chars in __itertools__.product(self.unigrams, repeat=self.degree):
+			yield "".join(chars)
+
+	def __getitem__(self, index):
+		if isinstance(index, slice):
+			return [self.ngram(i) for i in range(*index.indices(self.size))]
+		if index < 0:
+			index = index + self.size
+		return self.ngram(index)
+
+	def __eq__(self, other):
+		return isinstance(other, NgramAlphabet) and self.unigrams == other.unigrams and self.degree == other.degree
+
+	def __hash__(self):
+		return hash((tuple(self.unigrams), self.degree))
+
+	def __repr__(self):
+		return "NgramAlphabet(" + repr("".join(self.unigrams)) + ", " + str(self.degree) + ")"
+
+	def index(self, ngram):
+		'''
+		Return the index of the given n-gram. Raises ValueError if it isn't in the alphabet.
+		'''
+		if ngram not in self:
+			raise ValueError(repr(ngram) + " is not in the alphabet")
+		base = len(self.unigrams)
+		index = 0
+		for char in ngram:
+			index = index * base + self.__positions__[char]
+		return index
+
+	def ngram(self, index):
+		'''
+		Return the n-gram at the given index. Raises IndexError if there is no such n-gram.
+		'''
+		if index < 0 or index >= self.size:
+			raise IndexError("NgramAlphabet index out of range")
+		base = len(self.unigrams)
+		chars = []
+		for i in range(self.degree):
+			index, digit = divmod(index, base)
+			chars.append(self.unigrams[digit])
+		return "".join(reversed(chars))
+
+	def lower(self):
+		'''
+		Return this alphabet with every unigram lowercased.
+		'''
+		lowered = [char.lower() for char in self.unigrams]
+		if lowered == self.unigrams:
+			return self
+		return NgramAlphabet(lowered, self.degree)
+
+class SparseDistribution(dict):
+	'''
+	A frequency distribution over an alphabet which only stores the n-grams that differ from a default value.
+	Any other n-gram in the alphabet is treated as having the default value, e.g.: a smoothed count of 1.
+
+	Parameters
+	----------
+	values : { str -> number }
+		n-grams with their own value
+	alphabet : NgramAlphabet or Iterable
+		all possible n-grams
+	default : number
+		value of every n-gram in the alphabet that isn't in values
+	'''
+
+	def __init__(self, values, alphabet, default=0):
+		dict.__init__(self, values)
+		self.alphabet = alphabet
+		self.default = default
+
+	def __missing__(self, ngram):
+		if ngram in self.alphabet:
+			return self.default
+		raise KeyError(ngram)
+
+	def __contains__(self, ngram):
+		return dict.__contains__(self, ngram) or (self.default != 0 and ngram in self.alphabet)
+
+	def unseen(self):
+		'''
+		Return how many n-grams in the alphabet take the default value.
+		'''
+		stored = sum([1 for ngram in self.keys() if ngram in self.alphabet])
+		return __size__(self.alphabet) - stored
+
+	def total(self):
+		'''
+		Return the sum over every n-gram in the alphabet, including the ones with the default value.
+		'''
+		return sum(self.values()) + self.default * self.unseen()
+
+def get_ngram_alphabet(characters, degree, lazy=False):
+	'''
+	Given a collection of unigrams and a degree n, returns the list of all n-grams.
 
 	Parameters
 	----------
@@ -12,27 +153,22 @@ def get_ngram_alphabet(characters, degree):
 		a collection of unigrams
 	degree : int >= 1
 		degree of n-grams to compute
+
+	Keyword Arguments
+	-----------------
+	lazy : bool
+		if true, return an NgramAlphabet instead of a list. The unigrams must then be unique single characters.
+		Smoothing over an NgramAlphabet gives a SparseDistribution, which only stores the n-grams that were seen.
 	'''
 
 	# check arguments
 	if degree < 1:
 		raise ValueError("Degree must be >= 1")
+	if lazy:
+		return NgramAlphabet(characters, degree)
 
 	# create unigram alphabet
-	chars = ["a", "b", "c", "d", "e", "f", "g", "h", "i", "j", "k", "l", "m",
-			 "n", "o", "p", "q", "r", "s", "t", "u", "v", "w", "x", "y", "z"]
-	nums = ["1", "2", "3", "4", "5", "6", "7", "8", "9", "0"]
-	alphabet = None
-	if characters == "alpha":
-		alphabet = chars
-	elif characters == "numeric":
-		alphabet = nums
-	elif characters == "alphanumeric":
-		alphabet = chars + nums
-	elif not isinstance(characters, Iterable):
-		raise TypeError("characters must be Iterable or 'alpha', 'numeric', or 'alphanumeric'")
-	else:
-		alphabet = characters
+	alphabet = list(__unigram_alphabet__(characters))
 
 	# get all possible n-grams
 	def product(a, b):
@@ -47,8 +183,26 @@ def get_ngram_alphabet(characters, degree):
 
 	return ngrams
 
+def __unigram_alphabet__(characters):
+	'''
+	Turn "alpha", "numeric", "alphanumeric" or an Iterable of unigrams into a list of unigrams.
+	'''
+	chars = ["a", "b", "c", "d", "e", "f", "g", "h", "i", "j", "k", "l", "m",
+			 "n", "o", "p", "q", "r", "s", "t", "u", "v", "w", "x", "y", "z"]
+	nums = ["1", "2", "3", "4", "5", "6", "7", "8", "9", "0"]
+	if characters == "alpha":
+		return chars
+	elif characters == "numeric":
+		return nums
+	elif characters == "alphanumeric":
+		return chars + nums
+	elif not isinstance(characters, Iterable):
+		raise TypeError("characters must be Iterable or 'alpha', 'numeric', or 'alphanumeric'")
+	else:
+		return characters
+
 def levenshtein(string1, string2, case_sensitive=False,
-				insertion=1, deletion=1, skip=0, transform=1):
+				insertion=1, deletion=1, skip=0, transform=1, max_distance=None):
 	'''
 	Compute the Levenshtein distance between two strings.
 	Returns int
@@ -72,14 +226,152 @@ def levenshtein(string1, string2, case_sensitive=False,
 	------------------
 		case_sensitive : bool
 			whether uppercase and lowercase chars should be considered the same
+		max_distance : int
+			if given, only check whether the strings are within this distance. The exact distance is returned
+			when it is <= max_distance, otherwise max_distance + 1 is returned, often without filling out the
+			whole table.
+			default: None (always compute the exact distance)
 	'''
 	operations = {
 		"deletion" : deletion,
 		"insertion" : insertion,
 		"skip" : skip,
-		"transform " : transform
+		"transform" : transform
 	}
-	return edit_dist(string1, string2, operations, case_sensitive, minimise=True)
+	if max_distance is None:
+		return edit_dist(string1, string2, operations, case_sensitive, minimise=True)
+
+	if max_distance < 0:
+		raise ValueError("max_distance must be >= 0")
+	if not case_sensitive:
+		string1 = string1.lower()
+		string2 = string2.lower()
+	if insertion == deletion == transform == 1 and skip == 0:
+		return __myers__(string1, string2, max_distance)
+	return __bounded_edit_dist__(string1, string2, operations, max_distance)
+
+def __myers__(str1, str2, max_distance):
+	'''
+	Unit-cost Levenshtein distance using Myers' bit-parallel algorithm.
+	Each column of the table is kept as two bit vectors of vertical deltas (+1 and -1), so a whole column is
+	computed with a handful of integer operations. Returns max_distance + 1 once the distance must exceed max_distance.
+	'''
+
+	# the distance is at least the difference in length
+	if abs(len(str1) - len(str2)) > max_distance:
+		return max_distance + 1
+
+	# pattern is the shorter string, it sets the width of the bit vectors
+	if len(str1) > len(str2):
+		str1, str2 = str2, str1
+	if len(str1) == 0:
+		return len(str2)
+
+	# peq[c] has bit i set when str1[i] == c
+	peq = {}
+	for i, char in enumerate(str1):
+		peq[char] = peq.get(char, 0) | (1 << i)
+
+	mask = (1 << len(str1)) - 1
+	highbit = 1 << (len(str1) - 1)
+	pv = mask
+	mv = 0
+	score = len(str1)
+	remaining = len(str2)
+	for char in str2:
+		eq = peq.get(char, 0)
+		xv = eq | mv
+		xh = (((eq & pv) + pv) ^ pv) | eq
+		ph = mv | (~(xh | pv) & mask)
+		mh = pv & xh
+		if ph & highbit:
+			score = score + 1
+		elif mh & highbit:
+			score = score - 1
+
+		# each remaining column can lower the score by at most one
+		remaining = remaining - 1
+		if score - remaining > max_distance:
+			return max_distance + 1
+
+		ph = ((ph << 1) | 1) & mask
+		mh = (mh << 1) & mask
+		pv = (mh | ~(xv | ph)) & mask
+		mv = ph & xv
+
+	return score if score <= max_distance else max_distance + 1
+
+def __bounded_edit_dist__(str1, str2, operations, max_distance):
+	'''
+	Edit distance that only checks whether it is within max_distance, returning max_distance + 1 if it isn't.
+	When no operation has a negative cost, reaching cell (i,j) needs |i-j| insertions or deletions, so only the diagonal
+	band where |i-j| * min(insertion, deletion) <= max_distance is filled (Ukkonen's cutoff), which is O(max_distance * n).
+	It also gives up once every cell in a row is above max_distance. With negative costs, the whole table is filled.
+	'''
+	insertion = operations["insertion"]
+	deletion = operations["deletion"]
+	transform = operations["transform"]
+	skip = operations["skip"]
+	if min(operations.values()) < 0:
+		return __full_bounded_edit_dist__(str1, str2, operations, max_distance)
+
+	cheapest = min(insertion, deletion)
+	if abs(len(str1) - len(str2)) * cheapest > max_distance:
+		return max_distance + 1
+
+	# anything over max_distance is as good as infinite, so cells outside the band are max_distance + 1
+	outside = max_distance + 1
+	width = max(len(str1), len(str2)) if cheapest == 0 else max_distance // cheapest
+
+	# each row only holds the band, starting at column first
+	first = 0
+	botrow = [insertion * col for col in range(min(len(str2), width) + 1)]
+	for row in range(1, len(str1) + 1):
+		toprow = botrow
+		topfirst = first
+		first = max(0, row - width)
+		last = min(len(str2), row + width)
+		botrow = []
+		char = str1[row-1]
+		for col in range(first, last + 1):
+			if col == 0:
+				botrow.append(row * deletion)
+				continue
+			best = outside
+			above = col - topfirst
+			if above < len(toprow):
+				best = min(best, toprow[above] + deletion)
+			if 0 < above <= len(toprow):
+				best = min(best, toprow[above-1] + (skip if char == str2[col-1] else transform))
+			if col > first:
+				best = min(best, botrow[-1] + insertion)
+			botrow.append(best)
+		if min(botrow) > max_distance:
+			return max_distance + 1
+
+	end = len(str2) - first
+	if end >= len(botrow) or botrow[end] > max_distance:
+		return max_distance + 1
+	return botrow[end]
+
+def __full_bounded_edit_dist__(str1, str2, operations, max_distance):
+	'''
+	Edit distance over the whole table, capped at max_distance + 1, for costs where no part of the table can be ruled out.
+	'''
+	insertion = operations["insertion"]
+	deletion = operations["deletion"]
+	transform = operations["transform"]
+	skip = operations["skip"]
+	botrow = [insertion * i for i in range(len(str2) + 1)]
+	for row in range(1, len(str1) + 1):
+		toprow = botrow
+		botrow = [row * deletion]
+		char = str1[row-1]
+		for col in range(1, len(str2) + 1):
+			diagonal = toprow[col-1] + (skip if char == str2[col-1] else transform)
+			botrow.append(min(toprow[col] + deletion, botrow[col-1] + insertion, diagonal))
+
+	return botrow[-1] if botrow[-1] <= max_distance else max_distance + 1
 
 def seq_align(str1, str2, case_sensitive=False,
 			  match=1, mismatch=-1, skip=-2):
@@ -177,7 +469,135 @@ def edit_dist(str1, str2, operations, case_sensitive=False, minimise=True):
 
 	return botrow[-1]
 
-def alignment(str1, str2, match=1, mismatch=-1, skip=-2, case_sensitive=False, pad_character="_"):
+def levenshtein_many(query, candidates, case_sensitive=False,
+					 insertion=1, deletion=1, skip=0, transform=1, max_distance=None):
+	'''
+	Compute the Levenshtein distance from one string to each of many strings.
+	Returns numpy.ndarray, where element i is levenshtein(query, candidates[i]).
+
+	Parameters:
+	-----------
+		query : str
+			string to compare against every candidate
+		candidates : Iterable
+			strings to compare the query to
+
+	Operations and keyword arguments are the same as for levenshtein. With max_distance, distances over it are
+	returned as max_distance + 1, as levenshtein does, though every distance is still computed in full.
+	'''
+	operations = {
+		"deletion" : deletion,
+		"insertion" : insertion,
+		"skip" : skip,
+		"transform" : transform
+	}
+	distances = edit_dist_many(query, candidates, operations, case_sensitive, minimise=True)
+	if max_distance is None:
+		return distances
+	if max_distance < 0:
+		raise ValueError("max_distance must be >= 0")
+	return __np__.minimum(distances, max_distance + 1)
+
+def seq_align_many(query, candidates, case_sensitive=False,
+				   match=1, mismatch=-1, skip=-2):
+	'''
+	Compute the score of the optimal sequence alignment of one string with each of many strings.
+	Returns numpy.ndarray, where element i is seq_align(query, candidates[i]).
+
+	Operations and keyword arguments are the same as for seq_align.
+	'''
+	operations = {
+		"insertion" : skip,
+		"deletion" : skip,
+		"skip" : match,
+		"transform" : mismatch
+	}
+	return edit_dist_many(query, candidates, operations, case_sensitive, minimise=False)
+
+def edit_dist_many(query, candidates, operations, case_sensitive=False, minimise=True):
+	'''
+	Compute the edit distance from one string to each of many strings.
+	Returns numpy.ndarray, where element i is edit_dist(query, candidates[i], operations).
+
+	All candidates are scored at once: they are encoded into a padded array of character codes,
+	and the table is filled one row (character of the query) at a time for every candidate together.
+
+	Parameters:
+	-----------
+	query : str
+		string to compare against every candidate
+	candidates : Iterable
+		strings to compare the query to
+	operations : { str -> int }
+		operations to use and their associated cost, as for edit_dist.
+
+	Keyword Arguments:
+	------------------
+	case_sensitive : bool
+		Whether to treat uppercase and lowercase characters the same.
+		Default: False
+	minimise : bool
+		Whether we want the highest score, or the lowest score.
+		Default: True (lowest score)
+	'''
+
+	if "insertion" not in operations or "deletion" not in operations:
+		raise KeyError("Edit distance needs costs associated with insertion and deletion operations.")
+
+	candidates = list(candidates)
+	if not case_sensitive:
+		query = query.lower()
+		candidates = [c.lower() for c in candidates]
+
+	insertion = operations["insertion"]
+	deletion = operations["deletion"]
+	integral = all(isinstance(cost, int) for cost in operations.values())
+	if len(candidates) == 0:
+		return __np__.zeros(0, dtype=__np__.int64 if integral else __np__.float64)
+
+	# an operation that isn't allowed can never be picked
+	worst = __np__.inf if minimise else -__np__.inf
+	opt = __np__.minimum if minimise else __np__.maximum
+	transform = operations.get("transform", worst)
+	skip = operations.get("skip", worst)
+
+	codes, lengths = __encode_padded__(candidates)
+	cols = codes.shape[1] + 1
+	offsets = __np__.arange(cols) * insertion
+
+	# botrow[i] is the last row of the table for candidates[i]
+	botrow = __np__.tile(offsets.astype(__np__.float64), (len(candidates), 1))
+	for row in range(1, len(query)+1):
+		toprow = botrow
+		same = codes == ord(query[row-1])
+		diagonal = toprow[:,:-1] + __np__.where(same, skip, transform)
+		botrow = __np__.empty_like(toprow)
+		botrow[:,0] = row * deletion
+		botrow[:,1:] = opt(toprow[:,1:] + deletion, diagonal)
+
+		# insertions chain along the row: botrow[c] = opt over k <= c of (botrow[k] + (c-k) * insertion)
+		botrow = opt.accumulate(botrow - offsets, axis=1) + offsets
+
+	scores = botrow[__np__.arange(len(candidates)), lengths]
+	return scores.astype(__np__.int64) if integral else scores
+
+def __encode_padded__(strings, pad=-1):
+	'''
+	Encode strings as a padded 2D array of unicode code points.
+	Returns (numpy.ndarray, numpy.ndarray) : the (len(strings), longest) array of codes, and the length of each string.
+	'''
+	lengths = __np__.array([len(s) for s in strings], dtype=__np__.int64)
+	width = int(lengths.max()) if len(strings) > 0 else 0
+	codes = __np__.full((len(strings), width), pad, dtype=__np__.int64)
+	flat = __np__.frombuffer("".join(strings).encode("utf-32-le"), dtype=__np__.uint32)
+	rows = __np__.repeat(__np__.arange(len(strings)), lengths)
+	starts = __np__.cumsum(lengths) - lengths
+	cols = __np__.arange(len(flat)) - __np__.repeat(starts, lengths)
+	codes[rows, cols] = flat
+	return codes, lengths
+
+def alignment(str1, str2, match=1, mismatch=-1, skip=-2, case_sensitive=False, pad_character="_",
+			  linear_space=False, band=None):
 	'''
 	Compute the optimal alignment of two strings.
 	Returns (str,str).
@@ -209,12 +629,25 @@ def alignment(str1, str2, match=1, mismatch=-1, skip=-2, case_sensitive=False, p
 		case_sensitive : bool
 			whether you should treat uppercase and lowercase chars the same
 			(default=False)
+		linear_space : bool
+			if True, don't keep the whole table in memory. Rows are recomputed from checkpoints by divide and
+			conquer, using O(len(str2) * log(len(str1))) memory. The alignment is identical to the default mode.
+			(default=False)
+		band : int
+			if given, only consider alignments that stay within this many cells of the diagonal. Uses memory and
+			time proportional to the band rather than to len(str2), which suits long, near-identical strings.
+			The result is the same as the default mode whenever the optimal alignment stays inside the band.
+			Implies linear_space.
+			(default=None)
 	'''
 
 	if not case_sensitive:
 		str1 = str1.lower()
 		str2 = str2.lower()
 
+	if linear_space or band is not None:
+		return __alignment_checkpointed__(str1, str2, match, mismatch, skip, pad_character, band)
+
 	#------------------ helper function
 	def matching(c1, c2):
 		if (c1 == c2):
@@ -248,8 +681,8 @@ def alignment(str1, str2, match=1, mismatch=-1, skip=-2, case_sensitive=False, p
 	#------------------ recover alignment
 	row = rows-1
 	col = cols-1
-	align1 = ""
-	align2 = ""
+	align1 = []
+	align2 = []
 
 	# when you're at table[0][0] you've matched everything
 	while row != 0 or col != 0:
@@ -261,20 +694,20 @@ def alignment(str1, str2, match=1, mismatch=-1, skip=-2, case_sensitive=False, p
 		if row > 0 and col > 0 and table[row-1][col-1] + matching(str1[row-1], str2[col-1]) == score:
 			row = row - 1
 			col = col - 1
-			align1 = align1 + str1[row]
-			align2 = align2 + str2[col]
+			align1.append(str1[row])
+			align2.append(str2[col])
 
 		# came from above, append char to str1, space to str2
 		elif row > 0 and table[row-1][col] + skip == score:
 			row = row - 1
-			align1 = align1 + str1[row]
-			align2 = align2 + pad_character
+			align1.append(str1[row])
+			align2.append(pad_character)
 
 		# came from left, append char to str2, space to str1
 		elif col > 0 and table[row][col-1] + skip == score:
 			col = col - 1
-			align1 = align1 + pad_character
-			align2 = align2 + str2[col]
+			align1.append(pad_character)
+			align2.append(str2[col])
 
 		# this shouldn't happen, but just in case it does, let's be explicit....
 		else:
@@ -283,8 +716,129 @@ def alignment(str1, str2, match=1, mismatch=-1, skip=-2, case_sensitive=False, p
 	#------------------ return strings
 	# this reverses strings.
 	# thank you guido :^)
-	align1 = align1[::-1]
-	align2 = align2[::-1]
+	align1 = "".join(align1[::-1])
+	align2 = "".join(align2[::-1])
+	return (align1, align2)
+
+# how many table cells the checkpointed alignment will hold in memory before splitting the rows in half
+__ALIGN_BLOCK_CELLS__ = 1 << 20
+
+def __alignment_checkpointed__(str1, str2, match, mismatch, skip, pad_character, band):
+	'''
+	Compute the same alignment as the full table in alignment(), without holding the full table.
+
+	The traceback from the bottom-right cell only needs the rows it passes through. To trace back through
+	rows lo..hi we keep row lo, recompute forwards to the middle row, trace back through the bottom half,
+	and then recurse into the top half from where the path crossed the middle row. Only one row per level
+	of recursion is kept, plus one block of at most __ALIGN_BLOCK_CELLS__ cells which is traced directly.
+
+	When band is given, row r only holds the columns r-band .. r+band, each row being a (start, array) pair.
+	'''
+
+	rows = len(str1)
+	cols = len(str2)
+	if band is not None:
+		if band < 0:
+			raise ValueError("band must be >= 0")
+		if abs(rows - cols) > band:
+			raise ValueError("Strings differ in length by more than the band width, so they can't be aligned within it.")
+
+	integral = all(isinstance(x, int) for x in (match, mismatch, skip))
+	if integral:
+		dtype = __np__.int64
+		unreachable = -(1 << 60)
+		same = lambda x, y : x == y
+	else:
+		dtype = __np__.float64
+		unreachable = -__np__.inf
+		same = __math__.isclose
+	codes1 = __np__.array([ord(c) for c in str1], dtype=__np__.int64)
+	codes2 = __np__.array([ord(c) for c in str2], dtype=__np__.int64)
+
+	def window(row):
+		if band is None:
+			return 0, cols
+		return max(0, row - band), min(cols, row + band)
+
+	def next_row(row, prev, prev_start):
+		start, end = window(row)
+		prev_end = prev_start + len(prev) - 1
+		scores = __np__.full(end - start + 1, unreachable, dtype=dtype)
+
+		# came from above
+		lo, hi = max(start, prev_start), min(end, prev_end)
+		if lo <= hi:
+			scores[lo-start:hi-start+1] = prev[lo-prev_start:hi-prev_start+1] + skip
+
+		# came from above-left
+		lo, hi = max(start, 1, prev_start+1), min(end, prev_end+1)
+		if lo <= hi:
+			matching = __np__.where(codes2[lo-1:hi] == codes1[row-1], match, mismatch)
+			diagonal = prev[lo-1-prev_start:hi-prev_start] + matching
+			scores[lo-start:hi-start+1] = __np__.maximum(scores[lo-start:hi-start+1], diagonal)
+
+		# came from left: scores[c] = max over k <= c of (scores[k] + (c-k) * skip)
+		offsets = __np__.arange(len(scores), dtype=dtype) * skip
+		return __np__.maximum.accumulate(scores - offsets) + offsets, start
+
+	def trace(lo, lo_row, lo_start, row, col, align1, align2):
+		'''
+		Trace back from (row, col) until the path reaches row lo. Returns the column it reaches row lo at.
+		'''
+		if (row - lo + 1) * len(lo_row) > __ALIGN_BLOCK_CELLS__ and row - lo > 1:
+			mid = (lo + row) // 2
+			mid_row, mid_start = lo_row, lo_start
+			for r in range(lo+1, mid+1):
+				mid_row, mid_start = next_row(r, mid_row, mid_start)
+			col = trace(mid, mid_row, mid_start, row, col, align1, align2)
+			return trace(lo, lo_row, lo_start, mid, col, align1, align2)
+
+		# small enough to trace back directly
+		table = [(lo_start, lo_row.tolist())]
+		block_row, block_start = lo_row, lo_start
+		for r in range(lo+1, row+1):
+			block_row, block_start = next_row(r, block_row, block_start)
+			table.append((block_start, block_row.tolist()))
+
+		def value(r, c):
+			start, values = table[r - lo]
+			if c < start or c >= start + len(values):
+				return unreachable
+			return values[c - start]
+
+		while row > lo:
+			score = value(row, col)
+			if col > 0 and same(value(row-1, col-1) + (match if str1[row-1] == str2[col-1] else mismatch), score):
+				row = row - 1
+				col = col - 1
+				align1.append(str1[row])
+				align2.append(str2[col])
+			elif same(value(row-1, col) + skip, score):
+				row = row - 1
+				align1.append(str1[row])
+				align2.append(pad_character)
+			elif col > 0 and same(value(row, col-1) + skip, score):
+				col = col - 1
+				align1.append(pad_character)
+				align2.append(str2[col])
+			else:
+				raise IndexError("Something spooky happened while recovering optimal alignment. There is a cosmic logic error with this function.")
+		return col
+
+	align1 = []
+	align2 = []
+	start, end = window(0)
+	first_row = __np__.arange(end + 1, dtype=dtype) * skip
+	col = trace(0, first_row, 0, rows, cols, align1, align2)
+
+	# anything left on the first row is str2 aligned against padding
+	while col > 0:
+		col = col - 1
+		align1.append(pad_character)
+		align2.append(str2[col])
+
+	align1 = "".join(align1[::-1])
+	align2 = "".join(align2[::-1])
 	return (align1, align2)
 
 def ngram_frequency(string, degree, normed=False, smoothing=False, alphabet=None):
@@ -303,12 +857,17 @@ def ngram_frequency(string, degree, normed=False, smoothing=False, alphabet=None
 	-----------------
 	normed : bool
 		if false, return a dict of str -> count, if true, return a dict of str -> probability
+	smoothing : bool
+		if true, perform Laplace smoothing (add one to every n-gram in the alphabet)
+	alphabet : NgramAlphabet or Iterable
+		all possible n-grams, needed for smoothing. Smoothing over an NgramAlphabet returns a SparseDistribution,
+		whose keys(), values() and items() only cover the n-grams that were seen.
 	'''
 
 	# error checking
 	if degree < 1:
 		raise ValueError("Degree of n-gram frequency must be 1 or greater")
-	if smoothing and not alphabet:
+	if smoothing and alphabet is None:
 		raise TypeError("If you want to smooth you must specify all possible values in the alphabet.")
 
 	# n-gram frequency for one string
@@ -342,13 +901,19 @@ def ngram_frequency(string, degree, normed=False, smoothing=False, alphabet=None
 		raise TypeError("Must pass string or iterable to n-gram count")
 
 def __norm__(map):
+	if isinstance(map, SparseDistribution):
+		count = map.total()
+		return SparseDistribution({ key : 1.0 * map[key] / count for key in map.keys() }, map.alphabet, 1.0 * map.default / count)
 	count = sum(map.values())
 	return { key : 1.0 * map[key] / count for key in map }
 
 def __smooth__(map, alphabet):
 	'''
 	Perform Laplace smoothing on the given map (add one to all possible values in the alphabet).
+	If the alphabet is an NgramAlphabet, the n-grams that weren't seen aren't stored: a SparseDistribution is returned.
 	'''
+	if isinstance(alphabet, NgramAlphabet):
+		return SparseDistribution({ ngram : map[ngram] + 1 for ngram in map if ngram in alphabet }, alphabet, 1)
 	smoothed = {}
 	for ngram in alphabet:
 		if ngram in map:
@@ -362,14 +927,106 @@ def __ngram_freq_one__(string, degree):
 		return {}
 	dist = {}
 	for i in range(len(string) - degree + 1):
-		s = ""
-		for j in range(i,i+degree):
-			s = s + string[j]
-		if s not in dist:
-			dist[s] = 0
-		dist[s] = dist[s] + 1
+		s = string[i:i+degree]
+		dist[s] = dist.get(s, 0) + 1
 	return dist
 
+def ngram_ids(string, degree, alphabet="alphanumeric"):
+	'''
+	Encode the n-grams of the given string as integers.
+	Return: numpy.ndarray of int, the ID of each n-gram in order of appearance.
+
+	Each character is mapped to its index in the unigram alphabet, and an n-gram's ID is its characters'
+	indices read as a base-len(alphabet) number. IDs index into get_ngram_alphabet(alphabet, degree).
+	N-grams containing a character outside the alphabet are left out.
+
+	Parameters
+	----------
+	string : str or Iterable
+		string whose n-grams you want. If given several strings, n-grams don't span two strings.
+	degree : int
+		the degree of the ngram (1-grams, 2-grams, etc.)
+
+	Keyword Arguments
+	-----------------
+	alphabet : "alpha", "numeric", "alphanumeric", or Iterable
+		the unigrams that make up n-grams, as for get_ngram_alphabet. They must be unique single characters.
+		default = "alphanumeric"
+	'''
+
+	if degree < 1:
+		raise ValueError("Degree of n-gram IDs must be 1 or greater")
+	unigrams = list(__unigram_alphabet__(alphabet))
+	for char in unigrams:
+		if not isinstance(char, str) or len(char) != 1:
+			raise TypeError("n-gram IDs need an alphabet of single characters, but it contained " + repr(char))
+	if len(set(unigrams)) != len(unigrams):
+		raise ValueError("n-gram IDs need an alphabet without duplicates")
+	base = len(unigrams)
+	if base ** degree >= 2 ** 63:
+		raise ValueError("Too many possible n-grams to give each one an ID")
+
+	if isinstance(string, str):
+		strings = [string]
+	elif isinstance(string, Iterable):
+		strings = list(string)
+	else:
+		raise TypeError("Must pass string or iterable to n-gram IDs")
+
+	# map code points to alphabet indices, anything outside the alphabet is -1
+	codes = __np__.frombuffer("".join(strings).encode("utf-32-le"), dtype=__np__.uint32).astype(__np__.int64)
+	top = max([ord(char) for char in unigrams] + [0])
+	lookup = __np__.full(top + 2, -1, dtype=__np__.int64)
+	for index, char in enumerate(unigrams):
+		lookup[ord(char)] = index
+	indices = lookup[__np__.minimum(codes, top + 1)]
+
+	# separate strings with -1 so no n-gram spans two of them
+	lengths = __np__.array([len(s) for s in strings], dtype=__np__.int64)
+	indices = __np__.insert(indices, __np__.cumsum(lengths)[:-1], -1)
+
+	windows = len(indices) - degree + 1
+	if windows < 1:
+		return __np__.zeros(0, dtype=__np__.int64)
+	ids = __np__.zeros(windows, dtype=__np__.int64)
+	valid = __np__.ones(windows, dtype=bool)
+	for j in range(degree):
+		column = indices[j:j+windows]
+		ids = ids * base + column
+		valid &= column >= 0
+	return ids[valid]
+
+def ngram_counts(string, degree, alphabet="alphanumeric", normed=False, smoothing=False):
+	'''
+	Compute the n-gram frequency of the given string as an array.
+	Return: numpy.ndarray, where element i is the count of n-gram i of get_ngram_alphabet(alphabet, degree).
+
+	Parameters
+	----------
+	string : str or Iterable
+		string (or strings) whose n-grams you will count
+	degree : int
+		the degree of the ngram (1-grams, 2-grams, etc.)
+
+	Keyword Arguments
+	-----------------
+	alphabet : "alpha", "numeric", "alphanumeric", or Iterable
+		the unigrams that make up n-grams. N-grams with characters outside the alphabet aren't counted.
+		default = "alphanumeric"
+	normed : bool
+		if true, return probabilities instead of counts
+	smoothing : bool
+		if true, perform Laplace smoothing (add one to every possible n-gram)
+	'''
+	ids = ngram_ids(string, degree, alphabet)
+	counts = __np__.bincount(ids, minlength=len(__unigram_alphabet__(alphabet)) ** degree)
+	if smoothing:
+		counts = counts + 1
+	if normed:
+		total = counts.sum()
+		counts = counts / total if total > 0 else counts.astype(__np__.float64)
+	return counts
+
 def ngram_set(string, degree):
 	'''
 	Return the set of unique n-grams in the given string.
@@ -385,13 +1042,7 @@ def ngram_set(string, degree):
 		raise TypeError("Degree of n-gram set must be 1 or greater")
 	elif degree > len(string):
 		return set([])
-	ngrams = set([])
-	for i in range(len(string) - degree + 1):
-		s = ""
-		for j in range(i, i+degree):
-			s = s + string[j]
-		ngrams.add(s)
-	return ngrams
+	return set([string[i:i+degree] for i in range(len(string) - degree + 1)])
 
 def jaccard(string1, string2, ngram_degree=2):
 	'''
@@ -429,22 +1080,25 @@ def kullback_leibler(dist1, dist2, alphabet):
 	alphabet : Iterable
 		all possible values that the observations in the distributions could have taken on.
 		for example, if you're comparing strings by their bigrams, this should be every possble bigram.
+		only the n-grams the distributions store are visited, the rest are handled together. An alphabet that isn't
+		an NgramAlphabet is lowercased into a set the first time it's used, and the set is reused for later calls
+		with the same alphabet, so after that each call only costs as much as the distributions' support.
 
 	Properties
 	----------
 	- KL(p,q) =/= KL(q,p)
 	- KL(p,q) >= 0
 	'''
-	alphabet = [x.lower() for x in alphabet]
-	divergence = 0
-	for ngram in alphabet:
-		f1 = dist1[ngram] if ngram in dist1 else 0
-		f2 = dist2[ngram] if ngram in dist2 else 0
-		if f2 == 0 and f1 != 0:
-			raise ValueError("When computing KL(P,Q), Q_i=0 must imply P_i=0!")
-		if f1 != 0 and f2 != 0:
-			divergence = divergence + f1 * __math__.log(1.0 * f1 / f2)
-	return divergence
+	p, q, p_default, q_default, unseen = __support_vectors__(dist1, dist2, __alphabet_set__(alphabet, lower=True))
+	if ((p != 0) & (q == 0)).any() or (unseen > 0 and p_default != 0 and q_default == 0):
+		raise ValueError("When computing KL(P,Q), Q_i=0 must imply P_i=0!")
+	both = (p != 0) & (q != 0)
+	divergence = __math__.fsum((p[both] * __np__.log(p[both] / q[both])).tolist())
+
+	# every n-gram that neither distribution stores contributes the same amount
+	if unseen > 0 and p_default != 0:
+		divergence = divergence + unseen * p_default * __math__.log(1.0 * p_default / q_default)
+	return float(divergence)
 
 def kullback_leibler_distance(dist1, dist2, alphabet):
 	'''
@@ -462,7 +1116,7 @@ def kullback_leibler_distance(dist1, dist2, alphabet):
 	----------
 	- KLD(p,q) = KLD(q,p)
 	'''
-	return 0.5 * (kullback_leibler(dist1, dist2, alphabet) + kullback_leibler(dist1, dist2, alphabet))
+	return 0.5 * (kullback_leibler(dist1, dist2, alphabet) + kullback_leibler(dist2, dist1, alphabet))
 
 
 def bhattacharyya(dist1, dist2, alphabet):
@@ -474,7 +1128,8 @@ def bhattacharyya(dist1, dist2, alphabet):
 	dist1, dist2 : {str : float}
 		probability distributions for the n-grams of two strings
 	alphabet : Iterable
-		all possible n-grams
+		all possible n-grams. only the n-grams the distributions store are visited, the rest are handled together.
+		as for kullback_leibler, an alphabet that isn't an NgramAlphabet is made into a set once and reused.
 
 	Properties
 	----------
@@ -483,13 +1138,153 @@ def bhattacharyya(dist1, dist2, alphabet):
 
 	Traps
 	-----
-	- The alphabet passed in must not contain duplicates.
+	- Duplicates in the alphabet are only counted once. Before distributions were compared over their support,
+	  a duplicated n-gram was counted once per copy, which gave different results.
 	'''
-	coefficient = 0
-	for ngram in alphabet:
-		d1 = dist1[ngram] if ngram in dist1 else 0
-		d2 = dist2[ngram] if ngram in dist2 else 0
-		coefficient += __math__.sqrt(d1*d2)
+	p, q, p_default, q_default, unseen = __support_vectors__(dist1, dist2, __alphabet_set__(alphabet))
+	coefficient = __math__.fsum(__np__.sqrt(p * q).tolist()) + unseen * __math__.sqrt(p_default * q_default)
 	if coefficient == 0:
 		return 0
-	return -__math__.log(coefficient)
\ No newline at end of file
+	return -__math__.log(coefficient)
+
+def kullback_leibler_matrix(dists1, dists2, alphabet):
+	'''
+	Compute the Kullback-Leibler divergence from every distribution in dists1 to every distribution in dists2.
+	Return: numpy.ndarray of shape (len(dists1), len(dists2)), where element [i,j] is kullback_leibler(dists1[i], dists2[j], alphabet).
+	Pairs where Q_i=0 but P_i!=0 are inf instead of raising ValueError.
+
+	Parameters
+	----------
+	dists1, dists2 : Iterable of { str : float }
+		probability distributions to compare. May be SparseDistributions.
+	alphabet : NgramAlphabet or Iterable
+		all possible n-grams. Only the n-grams the distributions store are visited, the rest are handled together.
+	'''
+	p, q, p_default, q_default, unseen = __support_matrices__(dists1, dists2, __alphabet_set__(alphabet, lower=True))
+
+	with __np__.errstate(divide="ignore", invalid="ignore"):
+		entropy = __np__.where(p > 0, p * __np__.log(__np__.where(p > 0, p, 1)), 0).sum(axis=1)
+		cross = __np__.dot(p, __np__.log(__np__.where(q > 0, q, 1)).T)
+		divergence = entropy[:,None] - cross
+		impossible = __np__.dot((p > 0).astype(__np__.float64), (q == 0).T.astype(__np__.float64)) > 0
+
+		# every n-gram that no distribution stores contributes the same amount
+		if unseen > 0:
+			p_term = __np__.where(p_default > 0, p_default * __np__.log(__np__.where(p_default > 0, p_default, 1)), 0)
+			q_log = __np__.log(__np__.where(q_default > 0, q_default, 1))
+			divergence = divergence + unseen * (p_term[:,None] - p_default[:,None] * q_log[None,:])
+			impossible = impossible | ((p_default > 0)[:,None] & (q_default == 0)[None,:])
+
+	divergence[impossible] = __np__.inf
+	return divergence
+
+def kullback_leibler_distance_matrix(dists1, dists2, alphabet):
+	'''
+	Compute the Kullback-Leibler distance between every distribution in dists1 and every distribution in dists2.
+	Return: numpy.ndarray of shape (len(dists1), len(dists2)), where element [i,j] is kullback_leibler_distance(dists1[i], dists2[j], alphabet).
+
+	Parameters
+	----------
+	dists1, dists2 : Iterable of { str : float }
+		probability distributions to compare. May be SparseDistributions.
+	alphabet : NgramAlphabet or Iterable
+		all possible n-grams
+	'''
+	dists1 = list(dists1)
+	dists2 = list(dists2)
+	return 0.5 * (kullback_leibler_matrix(dists1, dists2, alphabet) + kullback_leibler_matrix(dists2, dists1, alphabet).T)
+
+def bhattacharyya_matrix(dists1, dists2, alphabet):
+	'''
+	Compute the Bhattacharyya distance between every distribution in dists1 and every distribution in dists2.
+	Return: numpy.ndarray of shape (len(dists1), len(dists2)), where element [i,j] is bhattacharyya(dists1[i], dists2[j], alphabet).
+
+	Parameters
+	----------
+	dists1, dists2 : Iterable of { str : float }
+		probability distributions to compare. May be SparseDistributions.
+	alphabet : NgramAlphabet or Iterable
+		all possible n-grams. Only the n-grams the distributions store are visited, the rest are handled together.
+	'''
+	p, q, p_default, q_default, unseen = __support_matrices__(dists1, dists2, __alphabet_set__(alphabet))
+	coefficient = __np__.dot(__np__.sqrt(p), __np__.sqrt(q).T)
+	coefficient = coefficient + unseen * __np__.outer(__np__.sqrt(p_default), __np__.sqrt(q_default))
+	with __np__.errstate(divide="ignore"):
+		return __np__.where(coefficient == 0, 0.0, -__np__.log(coefficient))
+
+def __support_matrices__(dists1, dists2, alphabet):
+	'''
+	Lay two collections of distributions out as dense matrices over the n-grams any of them store.
+	Return: (P, Q, P defaults, Q defaults, number of n-grams in the alphabet that no distribution stores).
+	'''
+	dists1 = list(dists1)
+	dists2 = list(dists2)
+	columns = {}
+	for dist in __itertools__.chain(dists1, dists2):
+		for ngram in dist.keys():
+			if ngram not in columns and ngram in alphabet:
+				columns[ngram] = len(columns)
+
+	def layout(dists):
+		defaults = __np__.array([__default__(dist) for dist in dists], dtype=__np__.float64)
+		matrix = __np__.repeat(defaults[:,None], len(columns), axis=1)
+		for i, dist in enumerate(dists):
+			for ngram in dist.keys():
+				if ngram in columns:
+					matrix[i, columns[ngram]] = dist[ngram]
+		return matrix, defaults
+
+	p, p_default = layout(dists1)
+	q, q_default = layout(dists2)
+	return p, q, p_default, q_default, __size__(alphabet) - len(columns)
+
+def __support_vectors__(dist1, dist2, alphabet):
+	'''
+	Lay two distributions out as vectors over the n-grams either of them stores, like __support_matrices__ for a single pair.
+	Return: (p, q, p default, q default, number of n-grams in the alphabet that neither distribution stores).
+	The n-grams come in no particular order, so sum over them with math.fsum to get the same result every time.
+	'''
+	ngrams = set(dist1.keys()).union(dist2.keys())
+	if isinstance(alphabet, (set, frozenset)):
+		ngrams = list(ngrams.intersection(alphabet))
+	else:
+		ngrams = [ngram for ngram in ngrams if ngram in alphabet]
+	p_default = __default__(dist1)
+	q_default = __default__(dist2)
+	p = __np__.fromiter(map(dist1.get, ngrams, __itertools__.repeat(p_default)), dtype=__np__.float64, count=len(ngrams))
+	q = __np__.fromiter(map(dist2.get, ngrams, __itertools__.repeat(q_default)), dtype=__np__.float64, count=len(ngrams))
+	return p, q, p_default, q_default, __size__(alphabet) - len(ngrams)
+
+# sets made from recently used alphabets by __alphabet_set__, keyed by (id, lower).
+# Each entry keeps its alphabet alive, so the id can't be reused by another object while it's cached.
+__ALPHABET_SETS__ = {}
+
+def __alphabet_set__(alphabet, lower=False):
+	'''
+	Return the alphabet, lowercased if lower is set, as something with fast membership tests.
+	Sets made from other alphabets are cached, so comparing many pairs over the same alphabet only builds one.
+	An alphabet whose length changes gets a new set, but one that's changed in place without changing length doesn't.
+	'''
+	if isinstance(alphabet, NgramAlphabet):
+		return alphabet.lower() if lower else alphabet
+	key = (id(alphabet), lower)
+	cached = __ALPHABET_SETS__.get(key)
+	if cached != None and cached[0] is alphabet and cached[1] == len(alphabet):
+		return cached[2]
+	members = set([x.lower() for x in alphabet]) if lower else set(alphabet)
+	if len(__ALPHABET_SETS__) >= 8:
+		__ALPHABET_SETS__.clear()
+	__ALPHABET_SETS__[key] = (alphabet, len(alphabet), members)
+	return members
+
+def __size__(alphabet):
+	'''
+	Return how many n-grams are in an alphabet, without going through len(), which can't count a huge NgramAlphabet.
+	'''
+	return alphabet.size if isinstance(alphabet, NgramAlphabet) else len(alphabet)
+
+def __default__(dist):
+	'''
+	Return the value a distribution gives n-grams it doesn't store.
+	'''
+	return dist.default if isinstance(dist, SparseDistribution) else 0
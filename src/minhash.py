@@ -0,0 +1,189 @@
+import ling as __ling__
+import zlib as __zlib__
+import numpy as __np__
+
+# permutations are h(x) = (a*x + b) mod __PRIME__, where x is a 32 bit hash of an n-gram.
+# __PRIME__ is the first prime above 2**32, so a*x + b always fits in 64 bits.
+__PRIME__ = 4294967311
+
+def __permutations__(num_perm, seed):
+	generator = __np__.random.RandomState(seed)
+	a = generator.randint(1, 2**32, size=num_perm, dtype=__np__.uint64)
+	b = generator.randint(0, 2**32, size=num_perm, dtype=__np__.uint64)
+	return a, b
+
+def minhash_signature(ngrams, num_perm=128, seed=1):
+	'''
+	Compute the MinHash signature of a set of n-grams.
+	Return: numpy.ndarray of num_perm ints. The fraction of positions where two signatures agree estimates
+	the Jaccard index of the two sets.
+
+	Parameters
+	----------
+	ngrams : Iterable
+		the n-grams of a string, e.g.: the output of ling.ngram_set
+
+	Keyword Arguments
+	-----------------
+	num_perm : int
+		how many hash functions to use. More gives a better estimate.
+		default = 128
+	seed : int
+		seed for the hash functions. Only signatures with the same seed and num_perm can be compared.
+		default = 1
+	'''
+	a, b = __permutations__(num_perm, seed)
+	return __signature__(ngrams, a, b)
+
+def __signature__(ngrams, a, b):
+	hashes = __np__.array([__zlib__.crc32(ngram.encode("utf-8")) for ngram in ngrams], dtype=__np__.uint64)
+	if len(hashes) == 0:
+		return __np__.full(len(a), __PRIME__, dtype=__np__.uint64)
+	permuted = (a[:,None] * hashes[None,:] + b[:,None]) % __PRIME__
+	return permuted.min(axis=1)
+
+def __choose_bands__(num_perm, threshold):
+	'''
+	Pick (bands, rows) so the LSH S-curve rises at the threshold: two strings become candidates with
+	probability 1 - (1 - s^rows)^bands, which is steepest around s = (1/bands)^(1/rows).
+	'''
+	best = None
+	for rows in range(1, num_perm + 1):
+		bands = num_perm // rows
+		error = abs((1.0 / bands) ** (1.0 / rows) - threshold)
+		if best == None or error < best[0]:
+			best = (error, bands, rows)
+	return best[1], best[2]
+
+class MinHashIndex(object):
+	'''
+	An index of strings for finding near-duplicates by the Jaccard index of their n-grams.
+
+	Each string's n-gram set is summarised by a MinHash signature, which is cut into bands. Strings sharing any
+	band are candidates, and candidates are checked with ling.jaccard, so results are exact but strings well
+	below the threshold the index was built for may be missed.
+
+	Keyword Arguments
+	-----------------
+	threshold : float between 0.0 and 1.0
+		the similarity the bands are tuned for. Queries at about this threshold or above find nearly all matches.
+		default = 0.5
+	num_perm : int
+		length of the MinHash signatures
+		default = 128
+	ngram_degree : int
+		degree of the n-grams compared, as for ling.jaccard
+		default = 2
+	bands : int
+		how many bands to cut signatures into. By default this is picked from the threshold.
+	seed : int
+		seed for the hash functions
+		default = 1
+	'''
+
+	def __init__(self, threshold=0.5, num_perm=128, ngram_degree=2, bands=None, seed=1):
+		if threshold < 0 or threshold > 1:
+			raise ValueError("Threshold must be between 0 and 1.")
+		if bands == None:
+			bands, rows = __choose_bands__(num_perm, threshold)
+		else:
+			if bands < 1 or bands > num_perm:
+				raise ValueError("Must have between 1 and num_perm bands.")
+			rows = num_perm // bands
+		self.threshold = threshold
+		self.ngram_degree = ngram_degree
+		self.bands = bands
+		self.rows = rows
+		self.__a__, self.__b__ = __permutations__(num_perm, seed)
+		self.__strings__ = []
+		self.__ids__ = {}
+		self.__buckets__ = [{} for i in range(bands)]
+
+	def __len__(self):
+		return len(self.__strings__)
+
+	def __contains__(self, string):
+		return string in self.__ids__
+
+	def __iter__(self):
+		return iter(self.__strings__)
+
+	def __keys__(self, string):
+		signature = __signature__(__ling__.ngram_set(string, self.ngram_degree), self.__a__, self.__b__)
+		return [signature[i*self.rows:(i+1)*self.rows].tobytes() for i in range(self.bands)]
+
+	def add(self, string):
+		'''
+		Add a string to this index.
+		Return bool : whether the string was added or not.
+
+		Parameters
+		----------
+			string : str
+				string to be added to the index
+		'''
+		if string in self.__ids__:
+			return False
+		index = len(self.__strings__)
+		self.__strings__.append(string)
+		self.__ids__[string] = index
+		for band, key in zip(self.__buckets__, self.__keys__(string)):
+			if key not in band:
+				band[key] = [index]
+			else:
+				band[key].append(index)
+		return True
+
+	def query(self, string, threshold=None):
+		'''
+		Find the strings in this index whose Jaccard index with the given string is at least threshold.
+		Return: list of (str, float), most similar first.
+
+		Parameters
+		----------
+			string : str
+				the string to look for near-duplicates of
+			threshold : float
+				minimum Jaccard index. Defaults to the threshold the index was built with.
+		'''
+		if threshold == None:
+			threshold = self.threshold
+		candidates = set([])
+		for band, key in zip(self.__buckets__, self.__keys__(string)):
+			if key in band:
+				candidates.update(band[key])
+		matches = []
+		for index in candidates:
+			other = self.__strings__[index]
+			similarity = __ling__.jaccard(string, other, self.ngram_degree)
+			if similarity >= threshold:
+				matches.append((other, similarity))
+		matches.sort(key=lambda pair : (-pair[1], pair[0]))
+		return matches
+
+	def all_pairs(self, threshold=None):
+		'''
+		Find every pair of strings in this index whose Jaccard index is at least threshold.
+		Return: list of (str, str, float), with the pair in the order the strings were added.
+
+		Parameters
+		----------
+			threshold : float
+				minimum Jaccard index. Defaults to the threshold the index was built with.
+		'''
+		if threshold == None:
+			threshold = self.threshold
+		candidates = set([])
+		for band in self.__buckets__:
+			for ids in band.values():
+				for i in range(len(ids)):
+					for j in range(i+1, len(ids)):
+						candidates.add((ids[i], ids[j]))
+		pairs = []
+		for i, j in sorted(candidates):
+			s1 = self.__strings__[i]
+			s2 = self.__strings__[j]
+			similarity = __ling__.jaccard(s1, s2, self.ngram_degree)
+			if similarity >= threshold:
+				pairs.append((s1, s2, similarity))
+		return pairs
@@ -3,9 +3,19 @@ import ling as __ling__
 from functools import reduce
 
 def __normalise__(map):
+	if isinstance(map, __ling__.SparseDistribution):
+		value_count = map.total()
+		return __ling__.SparseDistribution({ key : 1.0 * map[key] / value_count for key in map.keys() }, map.alphabet, 1.0 * map.default / value_count)
 	value_count = sum(map.values())
 	return { key : 1.0 * map[key] / value_count for key in map }
 
+def __smooth_sparse__(map, alphabet):
+	'''
+	Laplace smoothing over an NgramAlphabet: add one to the n-grams that were seen, and give every other n-gram
+	in the alphabet a default of one instead of storing it.
+	'''
+	return __ling__.SparseDistribution({ ngram : map[ngram] + 1 if ngram in alphabet else map[ngram] for ngram in map }, alphabet, 1)
+
 class Classifier(object):
 
 	ngrams = {}
@@ -18,6 +28,9 @@ class Classifier(object):
 			[(Iterable, str), (Iterable, str)]
 		ngram_degree
 
+		alphabet
+			all possible n-grams, for Laplace smoothing. If this is an NgramAlphabet, only the
+			n-grams seen in training are stored.
 		'''
 
 		self.ngrams = {}
@@ -42,6 +55,11 @@ class Classifier(object):
 						self.ngrams[ngram] += 1
 
 		# laplace smooting
+		if isinstance(alphabet, __ling__.NgramAlphabet):
+			self.ngrams = __smooth_sparse__(self.ngrams, alphabet)
+			for clazz in self.classes:
+				self.classes[clazz] = __smooth_sparse__(self.classes[clazz], alphabet)
+			alphabet = []
 		for ngram in alphabet:
 
 			# for the ngrams
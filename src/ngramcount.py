@@ -0,0 +1,172 @@
+import ling as __ling__
+import json as __json__
+import multiprocessing as __mp__
+from collections import Counter as __Counter__
+
+def __count_chunk__(job):
+	'''
+	Count the n-grams in a chunk of strings, splitting each one into words first if split is set.
+	Runs in worker processes, so it must stay at module level.
+	'''
+	strings, degree, split = job
+	counts = __Counter__()
+	for string in strings:
+		for word in (string.split() if split else [string]):
+			if len(word) >= degree:
+				counts.update([word[i:i+degree] for i in range(len(word) - degree + 1)])
+	return dict(counts)
+
+def __read_chunks__(paths, degree, chunk_size):
+	'''
+	Yield (lines, degree, split) jobs of roughly chunk_size bytes each from the given files.
+	'''
+	for path in paths:
+		with open(path, "r") as f:
+			while True:
+				lines = f.readlines(chunk_size)
+				if not lines:
+					break
+				yield (lines, degree, True)
+
+class NgramCounter(object):
+	'''
+	Streaming n-gram counter for corpora too large to count in one go with ling.ngram_frequency.
+	Files are read in chunks which are counted in a pool of processes, and the partial counts are merged.
+	A counter can be saved, loaded, and merged with others, so counts can be built up as new data arrives.
+
+	Parameters
+	----------
+	degree : int
+		the degree of the ngram (1-grams, 2-grams, etc.)
+	'''
+
+	def __init__(self, degree):
+		if degree < 1:
+			raise ValueError("Degree of n-gram frequency must be 1 or greater")
+		self.degree = degree
+		self.counts = {}
+
+	def __len__(self):
+		return len(self.counts)
+
+	def __getitem__(self, ngram):
+		return self.counts.get(ngram, 0)
+
+	def __add_counts__(self, counts):
+		for ngram in counts:
+			self.counts[ngram] = self.counts.get(ngram, 0) + counts[ngram]
+
+	def update(self, words):
+		'''
+		Count the n-grams of some more words, in this process. Like ling.ngram_frequency, each string is counted
+		whole, so n-grams can span the spaces in it.
+
+		Parameters
+		----------
+		words : str or Iterable
+			a string or a collection of strings
+		'''
+		if isinstance(words, str):
+			words = [words]
+		self.__add_counts__(__count_chunk__((words, self.degree, False)))
+
+	def count_files(self, paths, workers=None, chunk_size=1<<20):
+		'''
+		Count the n-grams of every whitespace-separated word in the given text files. Unlike update, lines are split
+		into words, so no n-gram spans a space or a line break.
+
+		Parameters
+		----------
+		paths : str or Iterable
+			a file path or a collection of them
+
+		Keyword Arguments
+		-----------------
+		workers : int
+			how many processes to count with. If 1, count in this process.
+			default = None (one per CPU)
+		chunk_size : int
+			roughly how many bytes of text each process counts at a time.
+			default = 1MB
+		'''
+		if isinstance(paths, str):
+			paths = [paths]
+		chunks = __read_chunks__(paths, self.degree, chunk_size)
+		if workers == 1:
+			for chunk in chunks:
+				self.__add_counts__(__count_chunk__(chunk))
+			return
+		pool = __mp__.Pool(workers)
+		try:
+			for counts in pool.imap_unordered(__count_chunk__, chunks):
+				self.__add_counts__(counts)
+		finally:
+			pool.close()
+			pool.join()
+
+	def merge(self, other):
+		'''
+		Add the counts of another NgramCounter to this one.
+
+		Parameters
+		----------
+		other : NgramCounter
+			counter of the same degree
+		'''
+		if not isinstance(other, NgramCounter):
+			raise TypeError("Can only merge with another NgramCounter.")
+		if other.degree != self.degree:
+			raise ValueError("Can only merge NgramCounters of the same degree.")
+		self.__add_counts__(other.counts)
+
+	def frequencies(self, normed=False, smoothing=False, alphabet=None):
+		'''
+		Return the counts as ling.ngram_frequency would, given everything that was counted as a list of strings.
+		Return: dict of str -> int, or str -> float if normed.
+
+		Keyword Arguments
+		-----------------
+		normed : bool
+			if false, return a dict of str -> count, if true, return a dict of str -> probability
+		smoothing : bool
+			if true, perform Laplace smoothing over the alphabet
+		alphabet : NgramAlphabet or Iterable
+			all possible n-grams, required when smoothing
+		'''
+		if smoothing and alphabet is None:
+			raise TypeError("If you want to smooth you must specify all possible values in the alphabet.")
+		dist = dict(self.counts)
+		if smoothing:
+			dist = __ling__.__smooth__(dist, alphabet)
+		if normed:
+			dist = __ling__.__norm__(dist)
+		return dist
+
+	def save(self, path):
+		'''
+		Save this counter to a file as JSON.
+
+		Parameters
+		----------
+		path : str
+			file to write to
+		'''
+		with open(path, "w") as f:
+			__json__.dump({ "degree" : self.degree, "counts" : self.counts }, f)
+
+	@staticmethod
+	def load(path):
+		'''
+		Load a counter saved with NgramCounter.save.
+		Return: NgramCounter
+
+		Parameters
+		----------
+		path : str
+			file to read from
+		'''
+		with open(path, "r") as f:
+			data = __json__.load(f)
+		counter = NgramCounter(data["degree"])
+		counter.counts = data["counts"]
+		return counter
@@ -0,0 +1,104 @@
+import ling as __ling__
+import multiprocessing as __mp__
+import numpy as __np__
+
+# set in each worker process by __init_worker__, so the strings are only sent once per process
+__shared__ = {}
+
+def __init_worker__(strings, metric, kwargs):
+	__shared__["strings"] = strings
+	__shared__["metric"] = metric
+	__shared__["kwargs"] = kwargs
+
+def __row__(strings, i, metric, kwargs):
+	'''
+	The metric from strings[i] to every later string.
+	'''
+	string = strings[i]
+	rest = strings[i+1:]
+	if metric == "levenshtein":
+		return __ling__.levenshtein_many(string, rest, **kwargs).astype(__np__.float64)
+	if metric == "seq_align":
+		return __ling__.seq_align_many(string, rest, **kwargs).astype(__np__.float64)
+	if isinstance(metric, str):
+		metric = getattr(__ling__, metric)
+	return __np__.array([metric(string, other, **kwargs) for other in rest], dtype=__np__.float64)
+
+def __block__(job):
+	'''
+	Condensed distances for rows start..stop. Runs in worker processes, so it must stay at module level.
+	'''
+	start, stop = job
+	strings = __shared__["strings"]
+	rows = [__row__(strings, i, __shared__["metric"], __shared__["kwargs"]) for i in range(start, stop)]
+	return start, stop, __np__.concatenate(rows) if rows else __np__.zeros(0)
+
+def pairwise_blocks(strings, metric="levenshtein", workers=None, block_rows=64, **kwargs):
+	'''
+	Compute a condensed matrix a block of rows at a time, for matrices too big to keep in memory.
+	Yields (start, stop, numpy.ndarray) in order: the metric from each of strings[start:stop] to every later
+	string, laid out as in pairwise(). Concatenating every block gives pairwise(strings, metric).
+	Like pairwise, the metric's raw values are returned, so they may be similarities rather than distances.
+
+	Parameters and keyword arguments are the same as for pairwise.
+	'''
+	strings = list(strings)
+	if not isinstance(metric, str) and not callable(metric):
+		raise TypeError("metric must be the name of a function in ling, or a function.")
+	if isinstance(metric, str) and not callable(getattr(__ling__, metric, None)):
+		raise ValueError("ling has no metric called " + metric)
+	jobs = [(start, min(start + block_rows, len(strings))) for start in range(0, len(strings), block_rows)]
+
+	if workers == 1:
+		__init_worker__(strings, metric, kwargs)
+		for job in jobs:
+			yield __block__(job)
+		return
+
+	pool = __mp__.Pool(workers, initializer=__init_worker__, initargs=(strings, metric, kwargs))
+	try:
+		for block in pool.imap(__block__, jobs):
+			yield block
+	finally:
+		pool.terminate()
+		pool.join()
+
+def pairwise(strings, metric="levenshtein", workers=None, block_rows=64, **kwargs):
+	'''
+	Compute the metric between every pair of strings.
+	Return: numpy.ndarray of length n*(n-1)/2. The value for strings i < j is at index
+	n*i - i*(i+1)/2 + (j-i-1), i.e.: rows of the upper triangle one after the other (as in scipy's condensed form).
+
+	The metric's raw values are returned as they are, so whether a bigger value means closer depends on the metric:
+		"levenshtein" : a distance, 0 for identical strings. Smaller is closer.
+		"seq_align" : an alignment score. Bigger is closer.
+		"jaccard" : a similarity, 1 for identical strings. Bigger is closer, and 1 - jaccard is a distance.
+	Convert similarities before passing them to anything that expects distances, e.g.: scipy's clustering.
+
+	Parameters
+	----------
+	strings : Iterable
+		the strings to compare
+	metric : str or function
+		"levenshtein", "seq_align", "jaccard", the name of any other two-string function in ling,
+		or a function of two strings. See above for which way each of them points. A function must be picklable (defined at module level) to use workers.
+		default = "levenshtein"
+
+	Keyword Arguments
+	-----------------
+	workers : int
+		how many processes to compute with. If 1, compute in this process.
+		default = None (one per CPU)
+	block_rows : int
+		how many rows of the matrix a process computes at a time.
+		default = 64
+	**kwargs
+		passed on to the metric, e.g.: case_sensitive=True
+	'''
+	strings = list(strings)
+	n = len(strings)
+	distances = __np__.zeros(n * (n - 1) // 2, dtype=__np__.float64)
+	for start, stop, block in pairwise_blocks(strings, metric, workers, block_rows, **kwargs):
+		offset = n * start - start * (start + 1) // 2
+		distances[offset:offset+len(block)] = block
+	return distances
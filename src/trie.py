@@ -1,9 +1,37 @@
+import array as __array__
+import bisect as __bisect__
+import collections as __collections__
+import mmap as __mmap__
+import struct as __struct__
+import sys as __sys__
+import heapq as __heapq__
+import numpy as __np__
+
+def __add_kid__(kids, char, child):
+	'''
+	Add child to a node's kids under char, keeping the kids in sorted order, so walking a node's children in
+	order needs no sort. Words mostly arrive with their characters in order, which only appends; otherwise the
+	dict is rebuilt, which costs no more than the sort it saves.
+	'''
+	if len(kids) == 0 or char > next(reversed(kids)):
+		kids[char] = child
+		return
+	items = sorted(list(kids.items()) + [(char, child)])
+	kids.clear()
+	kids.update(items)
+
 class __Node__:    
 
+    # a trie has a node per character, so keep them small
+    __slots__ = ("value", "kids", "isTerminal", "count", "weight", "leaders")
+
     def __init__(self, char, term=False):
         self.value = char
         self.kids = {}
         self.isTerminal = term
+        self.count = 0
+        self.weight = 0
+        self.leaders = None
         
     def __str__(self):
         return self.value
@@ -19,6 +47,8 @@ class __Node__:
             return child.__contains__(word,index+1)
     
     def __add__(self,word,index):
+        # only called for words not already in the trie, so every node on the path gains a word below it
+        self.count = self.count + 1
         if index == len(word):
             self.isTerminal = True
             return True
@@ -27,68 +57,80 @@ class __Node__:
             child = self.kids[char]
         else:
             child = __Node__(char)
-            self.kids[char] = child
+            __add_kid__(self.kids, char, child)
         return child.__add__(word,index+1)
         
 class __TrieIterator__:
 	'''
 	An iterator for the Trie. Uses a stack, and depth-first-search, to keep track of what node needs to come next.
+	The characters on the path to the current node are kept in one shared list, so moving between nodes doesn't
+	build any strings. A string is only made when a word is returned.
 	'''
 
-	def __init__(self, trie):
+	def __init__(self, trie, node=None, prefix=""):
 		self.trie = trie
-		self.stack = []
-		head = trie.head
-		children = head.kids
-		childkeys = list(children.keys())
-		childkeys.sort(reverse=True)
-		for key in childkeys:
-			self.stack.append((children[key],""))
+		if node == None:
+			node = trie.head
+		self.prefix = list(prefix)
+		self.pending = node.isTerminal
+		self.stack = [(node, iter(node.kids))]
 
 	def __iter__(self):
 		return self
 
 	def __next__(self):
-		while len(self.stack) > 0:
 
-			# pop next node from stack
-			pair = self.stack.pop()
-			node = pair[0]
-			string_sofar = pair[1]
+		# the node we started at may itself be a word
+		if self.pending:
+			self.pending = False
+			return "".join(self.prefix)
 
-			# construct string
-			string = string_sofar + node.value
+		while len(self.stack) > 0:
+			node, keys = self.stack[-1]
+			key = next(keys, None)
 
-			# push children onto stack
-			children = node.kids
-			childkeys = list(children.keys())
-			childkeys.sort(reverse=True) #stack is FILO, we want smaller children i.e.: a, b, c to be the last in so they first out
-			for key in childkeys:
-				childnode = children[key]
-				self.stack.append((childnode, string))
+			# all children visited, back up to the parent
+			if key == None:
+				self.stack.pop()
+				if len(self.stack) > 0:
+					self.prefix.pop()
+				continue
 
-			# check if we need to return value
-			if node.isTerminal:
-				return string
+			# descend into the next child; kids are kept in sorted order
+			child = node.kids[key]
+			self.prefix.append(key)
+			self.stack.append((child, iter(child.kids)))
+			if child.isTerminal:
+				return "".join(self.prefix)
 
 		raise StopIteration()
 
 class Trie:
         
-    def __init__(self, words=[]):
+    def __init__(self, words=[], leaders=0):
         '''
         Create and initialise a Trie.
 
         Keyword Arguments:
         ------------------
-        	words : iterable
-        		collection of words to put into the Trie.
+        	words : iterable or dict
+        		collection of words to put into the Trie. If a dict of str -> number, the values are the words' weights.
         		(default=[])
+        	leaders : int
+        		how many of the heaviest words below each node to keep, so Trie.complete can answer that many
+        		completions without searching the Trie.
+        		(default=0)
         '''
         self.count = 0
         self.head = __Node__("")
-        for word in words:
-            self.add(word)
+        self.automaton = None
+        self.leaders = leaders
+        if isinstance(words, dict):
+            for word in words:
+                self.add(word, words[word])
+        else:
+            for word in words:
+                self.add(word)
 
     def __iter__(self):
     	return __TrieIterator__(self)
@@ -99,7 +141,7 @@ class Trie:
     def __contains__(self,word):
         return self.head.__contains__(word,0)
     
-    def add(self, word):
+    def add(self, word, weight=None):
     	'''
     	Add a word to this Trie.
     	Return bool : whether the word was added or not.
@@ -108,15 +150,255 @@ class Trie:
     	-----------
     		word : str
     			word to be added to the Trie.
+    		weight : number
+    			weight of the word, e.g.: its frequency in a corpus. If the word is already in the Trie, its weight
+    			is replaced.
+    			(default=None, which is 0 for a new word and leaves an existing word's weight alone)
     	'''
     	if word in self:
+    		if weight != None:
+    			self.__reweigh__(word, weight)
     		return False
     	if self.head.__add__(word,0):
     		self.count = self.count + 1
+    		self.automaton = None
+    		if weight != None or self.leaders > 0:
+    			self.__reweigh__(word, 0 if weight == None else weight)
     		return True
     	else:
     		return False
+
+    def __reweigh__(self, word, weight):
+    	'''
+    	Set the weight of a word that is in the Trie, and keep the leaders on its path up to date.
+    	Leaders are stored as (-weight, word), so a sorted list has the heaviest words first.
+    	'''
+    	path = [self.head]
+    	for char in word:
+    		path.append(path[-1].kids[char])
+    	old = path[-1].weight
+    	path[-1].weight = weight
+    	if self.leaders == 0:
+    		return
+
+    	# a heavier word can only move up each node's leaders, so insert it in place
+    	if weight >= old:
+    		for node in path:
+    			leaders = [entry for entry in (node.leaders or []) if entry[1] != word]
+    			__bisect__.insort(leaders, (-weight, word))
+    			node.leaders = leaders[:self.leaders]
+    		return
+
+    	# a lighter word might fall out of the leaders, so rebuild them from the bottom up out of the kids' leaders
+    	for depth in range(len(path) - 1, -1, -1):
+    		node = path[depth]
+    		entries = [(-node.weight, word[:depth])] if node.isTerminal else []
+    		for kid in node.kids.values():
+    			entries.extend(kid.leaders or [])
+    		node.leaders = __heapq__.nsmallest(self.leaders, entries)
+
+    def weight(self, word):
+    	'''
+    	Return the weight of a word, or None if the word isn't in this Trie.
+
+    	Parameters:
+    	-----------
+    		word : str
+    			word to look up
+    	'''
+    	node = self.__find__(word)
+    	if node == None or not node.isTerminal:
+    		return None
+    	return node.weight
+
+    def complete(self, prefix, k=10):
+    	'''
+    	Find the k heaviest words starting with the given prefix.
+    	Return list of (str, number) : words and their weights, heaviest first, ties in sorted order.
+
+    	If k is no more than the Trie's leaders, the answer is read off the prefix's node in O(len(prefix) + k).
+    	Otherwise every word below the prefix is looked at.
+
+    	Parameters:
+    	-----------
+    		prefix : str
+    			prefix typed so far
+    		k : int
+    			how many completions to return
+    			(default=10)
+    	'''
+    	node = self.__find__(prefix)
+    	if node == None or k < 1:
+    		return []
+    	if k <= self.leaders:
+    		return [(word, -weight) for weight, word in (node.leaders or [])[:k]]
+    	entries = [(-self.__find__(word).weight, word) for word in __TrieIterator__(self, node, prefix)]
+    	return [(word, -weight) for weight, word in __heapq__.nsmallest(k, entries)]
     
+    def __find__(self, prefix):
+    	'''
+    	Return the node reached by following prefix from the head, or None if there isn't one.
+    	'''
+    	node = self.head
+    	for char in prefix:
+    		if char not in node.kids:
+    			return None
+    		node = node.kids[char]
+    	return node
+
+    def iter_prefix(self, prefix):
+    	'''
+    	Iterate over the words in this Trie that start with the given prefix, in sorted order.
+    	Only the part of the Trie below the prefix is visited.
+
+    	Parameters:
+    	-----------
+    		prefix : str
+    			prefix of the words to iterate over
+    	'''
+    	node = self.__find__(prefix)
+    	if node == None:
+    		return iter([])
+    	return __TrieIterator__(self, node, prefix)
+
+    def count_prefix(self, prefix):
+    	'''
+    	Count the words in this Trie that start with the given prefix.
+    	Return int. Costs O(len(prefix)): every node keeps count of the words below it.
+
+    	Parameters:
+    	-----------
+    		prefix : str
+    			prefix of the words to count
+    	'''
+    	node = self.__find__(prefix)
+    	return 0 if node == None else node.count
+
+    def contains_many(self, words):
+    	'''
+    	Check which of many words are in this Trie.
+    	Return numpy.ndarray of bool : element i is whether words[i] is in this Trie.
+
+    	The words are checked in sorted order, keeping the path walked for the previous word. Each word only
+    	descends from where it stops sharing a prefix with the one before it, so shared prefixes are walked once.
+
+    	Parameters:
+    	-----------
+    		words : iterable
+    			words to check
+    	'''
+    	words = list(words)
+    	found = __np__.zeros(len(words), dtype=bool)
+
+    	# path[i] is the node for the first i characters of the previous word, as far as the Trie has them
+    	path = [self.head]
+    	previous = ""
+    	for i in sorted(range(len(words)), key=words.__getitem__):
+    		word = words[i]
+    		shared = 0
+    		limit = min(len(word), len(previous), len(path) - 1)
+    		while shared < limit and word[shared] == previous[shared]:
+    			shared = shared + 1
+    		del path[shared+1:]
+    		node = path[-1]
+    		for char in word[shared:]:
+    			node = node.kids.get(char)
+    			if node == None:
+    				break
+    			path.append(node)
+    		found[i] = len(path) == len(word) + 1 and path[-1].isTerminal
+    		previous = word
+    	return found
+
+    def prefixes_of(self, string):
+    	'''
+    	Find every word in this Trie that is a prefix of the given string, in one walk along it.
+    	Return list of str, shortest first.
+
+    	Parameters:
+    	-----------
+    		string : str
+    			string whose prefixes to look for, e.g.: a domain label
+    	'''
+    	return [string[:end] for end in self.__prefix_ends__(string)]
+
+    def longest_prefix_of(self, string):
+    	'''
+    	Find the longest word in this Trie that is a prefix of the given string.
+    	Return str, or None if no word in this Trie is a prefix of it.
+
+    	Parameters:
+    	-----------
+    		string : str
+    			string whose prefixes to look for
+    	'''
+    	ends = self.__prefix_ends__(string)
+    	return string[:ends[-1]] if len(ends) > 0 else None
+
+    def __prefix_ends__(self, string):
+    	'''
+    	Return the lengths of the prefixes of string that are words, walking down the Trie once.
+    	'''
+    	node = self.head
+    	ends = [0] if node.isTerminal else []
+    	for i, char in enumerate(string):
+    		node = node.kids.get(char)
+    		if node == None:
+    			break
+    		if node.isTerminal:
+    			ends.append(i + 1)
+    	return ends
+
+    def fuzzy(self, word, max_distance):
+    	'''
+    	Find every word in this Trie within the given Levenshtein distance of word.
+    	Return list of (str, int) : the matching words and their distances, closest first.
+
+    	Walks the Trie once, carrying one row of the edit distance table per node: a node's row is computed from its
+    	parent's, so words sharing a prefix share that work. A branch is abandoned as soon as every value in its
+    	row exceeds max_distance, since going deeper can only add to them.
+
+    	Parameters:
+    	-----------
+    		word : str
+    			string to look up
+    		max_distance : int
+    			maximum number of insertions, deletions and substitutions
+    	'''
+    	first = list(range(len(word) + 1))
+    	matches = []
+    	if self.head.isTerminal and first[-1] <= max_distance:
+    		matches.append(("", first[-1]))
+    	stack = [(kid, key, first) for key, kid in self.head.kids.items()]
+    	while len(stack) > 0:
+    		node, string, above = stack.pop()
+    		char = string[-1]
+    		row = [above[0] + 1]
+    		for col in range(1, len(word) + 1):
+    			cost = 0 if word[col-1] == char else 1
+    			row.append(min(above[col] + 1, row[col-1] + 1, above[col-1] + cost))
+    		if node.isTerminal and row[-1] <= max_distance:
+    			matches.append((string, row[-1]))
+    		if min(row) <= max_distance:
+    			for key, kid in node.kids.items():
+    				stack.append((kid, string + key, row))
+    	matches.sort(key=lambda pair : (pair[1], pair[0]))
+    	return matches
+
+    def freeze(self):
+    	'''
+    	Return a compact, immutable copy of this Trie.
+    	Return FrozenTrie.
+    	'''
+    	return FrozenTrie(self)
+
+    def dawg(self):
+    	'''
+    	Return a minimal acyclic word graph holding the same words as this Trie.
+    	Return DAWG.
+    	'''
+    	return DAWG(self, presorted=True)
+
     def contains_substr_of(self, string):
     	'''
     	Check if any word in this Trie is a substring of the given string.
@@ -127,10 +409,557 @@ class Trie:
     		string : str
     			check to see if Trie contains a substring of this str
     	'''
-    	root = self.head
-    	for char in root.kids:
-    		kid = root.kids[char]
-    		result = kid.__substr__(string, char)
-    		if result:
-    			return True
+    	for match in self.find_substrs(string):
+    		return True
     	return False
+
+    def find_substrs(self, string):
+    	'''
+    	Find every occurrence of every word in this Trie within the given string, in one pass over it.
+    	Yields (int, str) : the offset the word starts at, and the word. Matches are ordered by where they end,
+    	longest first. The empty word never matches.
+
+    	Parameters:
+    	-----------
+    		string : str
+    			text to scan
+    	'''
+    	if self.automaton == None:
+    		self.automaton = AhoCorasick(self)
+    	return self.automaton.find(string)
+
+class __PersistentNode__:
+	'''
+	A node of a PersistentTrie. Once a node is reachable from a published PersistentTrie it is never changed.
+	'''
+
+	def __init__(self, kids=None, isTerminal=False, count=0):
+		self.kids = {} if kids == None else dict(kids)
+		self.isTerminal = isTerminal
+		self.count = count
+
+	def copy(self):
+		return __PersistentNode__(self.kids, self.isTerminal, self.count)
+
+class PersistentTrie:
+	'''
+	An immutable Trie. Adding words returns a new PersistentTrie and leaves this one untouched, so readers can keep
+	querying the version they hold, without locks, while another thread builds newer versions.
+
+	Updates copy only the nodes on the new word's path and share everything else with the old version, so an
+	add costs O(len(word)) whatever the size of the trie. A typical use is to keep the current version in one
+	shared variable: readers take a reference to it, and the writer replaces it with the result of add/update,
+	which is a single atomic assignment.
+
+	Keyword Arguments:
+	------------------
+		words : iterable
+			collection of words to put into the PersistentTrie.
+			(default=[])
+	'''
+
+	def __init__(self, words=[], head=None):
+		self.head = __PersistentNode__() if head == None else head
+		if words:
+			self.head = PersistentTrie.__insert_all__(self.head, words)
+
+	@staticmethod
+	def __insert_all__(head, words):
+		'''
+		Insert words into a copy of the trie below head, and return the new head.
+		Nodes copied during this call aren't visible to anyone else yet, so they're changed in place rather than
+		copied again for every word that passes through them.
+		'''
+		owned = set([])
+
+		def own(node):
+			if id(node) in owned:
+				return node
+			node = node.copy()
+			owned.add(id(node))
+			return node
+
+		for word in words:
+			if PersistentTrie.__lookup__(head, word):
+				continue
+			head = own(head)
+			node = head
+			node.count = node.count + 1
+			for char in word:
+				child = node.kids.get(char)
+				if child != None:
+					child = own(child)
+					node.kids[char] = child
+				else:
+					child = own(__PersistentNode__())
+					__add_kid__(node.kids, char, child)
+				node = child
+				node.count = node.count + 1
+			node.isTerminal = True
+		return head
+
+	@staticmethod
+	def __lookup__(head, word):
+		node = head
+		for char in word:
+			node = node.kids.get(char)
+			if node == None:
+				return False
+		return node.isTerminal
+
+	def __iter__(self):
+		return __TrieIterator__(self, self.head)
+
+	def __len__(self):
+		return self.head.count
+
+	def __contains__(self, word):
+		return PersistentTrie.__lookup__(self.head, word)
+
+	def add(self, word):
+		'''
+		Return a new PersistentTrie holding this one's words and the given word.
+		If the word is already here, this PersistentTrie is returned.
+
+		Parameters:
+		-----------
+			word : str
+				word to be added.
+		'''
+		return self.update([word])
+
+	def update(self, words):
+		'''
+		Return a new PersistentTrie holding this one's words and the given words.
+		If none of them are new, this PersistentTrie is returned.
+
+		Parameters:
+		-----------
+			words : iterable
+				words to be added.
+		'''
+		head = PersistentTrie.__insert_all__(self.head, words)
+		return self if head is self.head else PersistentTrie(head=head)
+
+	def iter_prefix(self, prefix):
+		'''
+		Iterate over the words in this PersistentTrie that start with the given prefix, in sorted order.
+
+		Parameters:
+		-----------
+			prefix : str
+				prefix of the words to iterate over
+		'''
+		node = self.head
+		for char in prefix:
+			node = node.kids.get(char)
+			if node == None:
+				return iter([])
+		return __TrieIterator__(self, node, prefix)
+
+	def count_prefix(self, prefix):
+		'''
+		Count the words in this PersistentTrie that start with the given prefix.
+
+		Parameters:
+		-----------
+			prefix : str
+				prefix of the words to count
+		'''
+		node = self.head
+		for char in prefix:
+			node = node.kids.get(char)
+			if node == None:
+				return 0
+		return node.count
+
+class FrozenTrie:
+	'''
+	An immutable Trie stored in a few flat arrays instead of one Python object per node. Supports the same
+	in, len and iteration as Trie, in a fraction of the memory.
+
+	Nodes are numbered breadth-first, which puts the children of every node next to each other in sorted order:
+		labels[i] : code point of the character on the edge into node i (node 0 is the root)
+		first[i] : index of node i's first child. Its children are first[i] .. first[i+1]-1
+		terminal[i] : 1 if a word ends at node i
+	Looking up a character is a binary search over the node's children.
+
+	The arrays can be saved to a file with save() and opened with FrozenTrie.load(), which maps the file into
+	memory and queries it in place, so every process that loads the same file shares one copy in the page cache.
+
+	Keyword Arguments:
+	------------------
+		words : Trie or iterable
+			collection of words to put into the FrozenTrie.
+			(default=[])
+	'''
+
+	# file format: magic, version, word count, node count, then labels, first and terminal as little-endian arrays
+	__MAGIC__ = b"CPYTRIE\0"
+	__VERSION__ = 1
+	__HEADER__ = __struct__.Struct("<8sIIQQ")
+
+	def __init__(self, words=[]):
+		trie = words if isinstance(words, Trie) else Trie(words)
+		self.count = len(trie)
+		self.labels = __array__.array("I", [0])
+		self.first = __array__.array("I")
+		self.terminal = bytearray([1 if trie.head.isTerminal else 0])
+
+		queue = __collections__.deque([trie.head])
+		numbered = 1
+		while len(queue) > 0:
+			node = queue.popleft()
+			self.first.append(numbered)
+			for key, kid in node.kids.items():
+				self.labels.append(ord(key))
+				self.terminal.append(1 if kid.isTerminal else 0)
+				queue.append(kid)
+				numbered = numbered + 1
+		self.first.append(numbered)
+
+	def __len__(self):
+		return self.count
+
+	def __child__(self, node, char):
+		'''
+		Return the child of node along char, or -1 if there isn't one.
+		'''
+		lo = self.first[node]
+		hi = self.first[node+1]
+		code = ord(char)
+		i = __bisect__.bisect_left(self.labels, code, lo, hi)
+		if i == hi or self.labels[i] != code:
+			return -1
+		return i
+
+	def __find__(self, string):
+		'''
+		Return the node reached by following string from the root, or -1 if there isn't one.
+		'''
+		node = 0
+		for char in string:
+			node = self.__child__(node, char)
+			if node < 0:
+				return -1
+		return node
+
+	def __contains__(self, word):
+		node = self.__find__(word)
+		return node >= 0 and self.terminal[node] == 1
+
+	def __iter__(self):
+		return self.__walk__(0, [])
+
+	def __walk__(self, node, prefix):
+		'''
+		Yield the words below node in sorted order, each starting with prefix.
+		The characters of the current path are kept in one list, rather than building a string per node.
+		'''
+		if self.terminal[node]:
+			yield "".join(prefix)
+		stack = [(node, self.first[node])]
+		while len(stack) > 0:
+			node, child = stack[-1]
+			if child == self.first[node+1]:
+				stack.pop()
+				if len(stack) > 0:
+					prefix.pop()
+				continue
+			stack[-1] = (node, child + 1)
+			prefix.append(chr(self.labels[child]))
+			if self.terminal[child]:
+				yield "".join(prefix)
+			stack.append((child, self.first[child]))
+
+	def iter_prefix(self, prefix):
+		'''
+		Iterate over the words in this FrozenTrie that start with the given prefix, in sorted order.
+
+		Parameters:
+		-----------
+			prefix : str
+				prefix of the words to iterate over
+		'''
+		node = self.__find__(prefix)
+		if node < 0:
+			return iter([])
+		return self.__walk__(node, list(prefix))
+
+	def nbytes(self):
+		'''
+		Return the number of bytes used by this FrozenTrie's arrays.
+		'''
+		return self.labels.itemsize * len(self.labels) + self.first.itemsize * len(self.first) + len(self.terminal)
+
+	def save(self, path):
+		'''
+		Write this FrozenTrie to a file that FrozenTrie.load can map into memory.
+
+		Parameters:
+		-----------
+			path : str
+				file to write to
+		'''
+		header = FrozenTrie.__HEADER__.pack(FrozenTrie.__MAGIC__, FrozenTrie.__VERSION__, 0, self.count, len(self.terminal))
+		with open(path, "wb") as f:
+			f.write(header)
+			# the file always holds little-endian 4-byte ints, whatever this platform's array("I") is
+			for values in [self.labels, self.first]:
+				f.write(__np__.asarray(values).astype("<u4").tobytes())
+			f.write(bytes(self.terminal))
+
+	@staticmethod
+	def load(path):
+		'''
+		Open a file written by FrozenTrie.save without reading it in. The file is memory-mapped and queried in place.
+		Return FrozenTrie.
+
+		Parameters:
+		-----------
+			path : str
+				file to read from
+		'''
+		if __sys__.byteorder != "little" or __array__.array("I").itemsize != 4:
+			raise NotImplementedError("Memory-mapped FrozenTries need little-endian, 4-byte unsigned ints.")
+		with open(path, "rb") as f:
+			buffer = __mmap__.mmap(f.fileno(), 0, access=__mmap__.ACCESS_READ)
+		header = FrozenTrie.__HEADER__
+		magic, version, unused, count, nodes = header.unpack_from(buffer, 0)
+		if magic != FrozenTrie.__MAGIC__:
+			raise ValueError(path + " is not a FrozenTrie file.")
+		if version != FrozenTrie.__VERSION__:
+			raise ValueError(path + " is FrozenTrie format version " + str(version) + ", expected " + str(FrozenTrie.__VERSION__))
+		if len(buffer) != header.size + 4 * nodes + 4 * (nodes + 1) + nodes:
+			raise ValueError(path + " is truncated.")
+
+		trie = FrozenTrie.__new__(FrozenTrie)
+		view = memoryview(buffer)
+		start = header.size
+		trie.count = count
+		trie.labels = view[start:start + 4*nodes].cast("I")
+		start = start + 4*nodes
+		trie.first = view[start:start + 4*(nodes+1)].cast("I")
+		start = start + 4*(nodes+1)
+		trie.terminal = view[start:start + nodes]
+		trie.mmap = buffer
+		return trie
+
+class DAWG:
+	'''
+	An immutable, minimal directed acyclic word graph. Like a FrozenTrie, but words share suffixes as well as
+	prefixes: any two nodes with the same words below them are merged. Supports in, len and iteration like Trie.
+
+	Built in one pass over sorted words (Daciuk et al.'s incremental algorithm): once a word has been added, the
+	parts of the previous word that aren't a prefix of it can't change any more, so they're merged into a
+	register of distinct nodes straight away. Only one path of unmerged nodes is held at a time.
+
+	The graph is stored in flat arrays:
+		first[i] : index of node i's first edge. Its edges are first[i] .. first[i+1]-1, sorted by label
+		labels[e], targets[e] : code point of edge e's character, and the node it leads to
+		terminal[i] : 1 if a word ends at node i
+	Node 0 is the root.
+
+	Keyword Arguments:
+	------------------
+		words : iterable
+			collection of words to put into the DAWG, e.g. a Trie.
+			(default=[])
+		presorted : bool
+			whether words are already in sorted order. If False they are sorted first.
+			(default=False)
+	'''
+
+	def __init__(self, words=[], presorted=False):
+		if not presorted:
+			words = sorted(words)
+
+		# nodes are [terminal, {char : node id}] while building
+		nodes = { 0 : [False, {}] }
+		register = {}
+		unchecked = []
+		numbered = [1]
+		count = 0
+
+		def minimise(down_to):
+			for i in range(len(unchecked) - 1, down_to - 1, -1):
+				parent, char, child = unchecked[i]
+				terminal, kids = nodes[child]
+				key = (terminal, tuple(sorted(kids.items())))
+				if key in register:
+					nodes[parent][1][char] = register[key]
+					del nodes[child]
+				else:
+					register[key] = child
+			del unchecked[down_to:]
+
+		previous = None
+		for word in words:
+			if previous != None and word <= previous:
+				if word == previous:
+					continue
+				raise ValueError("DAWG words must be in sorted order, but " + repr(word) + " came after " + repr(previous))
+
+			# length of the prefix shared with the previous word
+			common = 0
+			if previous != None:
+				limit = min(len(word), len(previous))
+				while common < limit and word[common] == previous[common]:
+					common = common + 1
+			minimise(common)
+
+			node = unchecked[-1][2] if len(unchecked) > 0 else 0
+			for char in word[common:]:
+				child = numbered[0]
+				numbered[0] = child + 1
+				nodes[child] = [False, {}]
+				nodes[node][1][char] = child
+				unchecked.append((node, char, child))
+				node = child
+			nodes[node][0] = True
+			count = count + 1
+			previous = word
+		minimise(0)
+
+		# number the nodes breadth-first and lay their edges out in arrays
+		self.count = count
+		self.first = __array__.array("I")
+		self.labels = __array__.array("I")
+		self.targets = __array__.array("I")
+		self.terminal = bytearray()
+		numbers = { 0 : 0 }
+		order = [0]
+		i = 0
+		while i < len(order):
+			terminal, kids = nodes[order[i]]
+			self.first.append(len(self.labels))
+			self.terminal.append(1 if terminal else 0)
+			for char in sorted(kids.keys()):
+				kid = kids[char]
+				if kid not in numbers:
+					numbers[kid] = len(order)
+					order.append(kid)
+				self.labels.append(ord(char))
+				self.targets.append(numbers[kid])
+			i = i + 1
+		self.first.append(len(self.labels))
+
+	def __len__(self):
+		return self.count
+
+	def __child__(self, node, char):
+		'''
+		Return the node reached from node along char, or -1 if there isn't one.
+		'''
+		lo = self.first[node]
+		hi = self.first[node+1]
+		code = ord(char)
+		i = __bisect__.bisect_left(self.labels, code, lo, hi)
+		if i == hi or self.labels[i] != code:
+			return -1
+		return self.targets[i]
+
+	def __contains__(self, word):
+		node = 0
+		for char in word:
+			node = self.__child__(node, char)
+			if node < 0:
+				return False
+		return self.terminal[node] == 1
+
+	def __iter__(self):
+		prefix = []
+		if self.terminal[0]:
+			yield ""
+		stack = [(0, self.first[0])]
+		while len(stack) > 0:
+			node, edge = stack[-1]
+			if edge == self.first[node+1]:
+				stack.pop()
+				if len(stack) > 0:
+					prefix.pop()
+				continue
+			stack[-1] = (node, edge + 1)
+			child = self.targets[edge]
+			prefix.append(chr(self.labels[edge]))
+			if self.terminal[child]:
+				yield "".join(prefix)
+			stack.append((child, self.first[child]))
+
+	def nodes(self):
+		'''
+		Return the number of nodes in this DAWG.
+		'''
+		return len(self.terminal)
+
+	def nbytes(self):
+		'''
+		Return the number of bytes used by this DAWG's arrays.
+		'''
+		edges = self.labels.itemsize * len(self.labels) + self.targets.itemsize * len(self.targets)
+		return edges + self.first.itemsize * len(self.first) + len(self.terminal)
+
+class AhoCorasick:
+	'''
+	An Aho-Corasick automaton over the words of a Trie, for finding all of them in a text in one pass.
+
+	Each state is a node of the Trie. A state's failure link points to the state for the longest proper suffix of
+	its string that is also in the Trie, so on a mismatch the scan falls back along failure links instead of
+	restarting. Each state's output link points to the nearest state along its failure links where a word ends.
+
+	Parameters:
+	-----------
+		trie : Trie
+			the words to look for
+	'''
+
+	def __init__(self, trie):
+		self.kids = [{}]
+		self.fail = [0]
+		self.output = [-1]
+		self.words = [None]
+
+		# number the trie's nodes breadth-first, so every state's failure link is numbered before it
+		queue = __collections__.deque([(trie.head, 0, "")])
+		while len(queue) > 0:
+			node, state, string = queue.popleft()
+			for char in node.kids:
+				kid = node.kids[char]
+				child = len(self.kids)
+				self.kids[state][char] = child
+				self.kids.append({})
+				self.words.append(string + char if kid.isTerminal else None)
+
+				# follow failure links from the parent until one can be extended by char
+				fallback = 0
+				if state != 0:
+					fallback = self.fail[state]
+					while fallback != 0 and char not in self.kids[fallback]:
+						fallback = self.fail[fallback]
+					fallback = self.kids[fallback].get(char, 0)
+				self.fail.append(fallback)
+				self.output.append(fallback if self.words[fallback] != None else self.output[fallback])
+				queue.append((kid, child, string + char))
+
+	def find(self, string):
+		'''
+		Yield (offset, word) for every occurrence of a word in the given string.
+		'''
+		state = 0
+		for i, char in enumerate(string):
+			while state != 0 and char not in self.kids[state]:
+				state = self.fail[state]
+			state = self.kids[state].get(char, 0)
+			match = state if self.words[state] != None else self.output[state]
+			while match > 0:
+				word = self.words[match]
+				yield (i - len(word) + 1, word)
+				match = self.output[match]
+
+	def contains_any(self, string):
+		'''
+		Return whether any word occurs in the given string.
+		'''
+		for match in self.find(string):
+			return True
+		return False
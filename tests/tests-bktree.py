@@ -0,0 +1,67 @@
+import inspect
+import sys
+import os
+
+here = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.normpath(os.path.join(here, "../src")))
+
+from bktree import *
+
+def assertion(assertion, correct_msg, failure_msg):
+	if assertion:
+		print(correct_msg)
+		return True
+	else:
+		print(failure_msg)
+		return False
+
+__words__ = ["book", "books", "cake", "boo", "boon", "cook", "cape", "cart"]
+
+def test_within_1():
+	tree = BKTree(__words__)
+	ans = tree.within("bool", 1)
+	correct_ans = [("boo", 1), ("book", 1), ("boon", 1)]
+	return assertion(ans == correct_ans,
+		"Passed within_1",
+		"Failed within_1: got " + str(ans) + " but should have been " + str(correct_ans))
+
+def test_nearest_1():
+	tree = BKTree(__words__)
+	ans = tree.nearest("cakes", 2)
+	correct_ans = [("cake", 1), ("cape", 2)]
+	return assertion(ans == correct_ans,
+		"Passed nearest_1",
+		"Failed nearest_1: got " + str(ans) + " but should have been " + str(correct_ans))
+
+def test_save_1():
+	tree = BKTree(__words__)
+	path = os.path.join(here, "bktree-test.pkl")
+	tree.save(path)
+	loaded = BKTree.load(path)
+	os.remove(path)
+	claim = len(loaded) == len(__words__) and "cart" in loaded and "carts" not in loaded
+	return assertion(claim,
+		"Passed save_1",
+		"Failed save_1: loaded tree had different contents")
+
+def main():
+
+	tests = [obj for name,obj in inspect.getmembers(sys.modules[__name__]) if (inspect.isfunction(obj) and name.startswith("test"))]
+	sortkey = lambda x : str(x)
+	tests.sort(key=sortkey)
+	print("=================")
+	print(len(tests), "tests.")
+	print("Running tests....")
+	print()
+	count = 0
+	for test in tests:
+		if test():
+			count = count + 1
+	pct = 1.0 * count / len(tests) * 100
+	print()
+	print("Finished.")
+	print("Passed: " + str(count) + "/" + str(len(tests)) + " ("+str(pct)+"%)")
+	print("================")
+	
+if __name__ == "__main__":
+	main()
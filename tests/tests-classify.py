@@ -28,6 +28,17 @@ def english_matcher():
 def language_classifier():
 	return LanguageClassifier({"English" : english_matcher(), "Maori" : maori_matcher()})
 
+def test_cache_3():
+	classifier = LanguageClassifier({"A" : CorpusMatcher(0.5, trainingSet=["ab"])}, cache=16)
+	before = classifier.classify_words("ac", all_classifications=True)
+	replacement = CorpusMatcher(0.5, trainingSet=["ac"])
+	classifier.__categories__["A"] = replacement
+	after = classifier.classify_words("ac", all_classifications=True)
+	claim = before["A"] == 0.0 and after["A"] == 1.0
+	return assertion(claim,
+		"test_cache_3 passed.",
+		"test_cache_3 failed: cache served scores from a matcher that had been replaced, scores were " + str(before) + " and " + str(after))
+
 def test_classification_1():
 	text1 = "Hey, how are you? My name is Aaron. It's good to meet you. I'm currently typing this out and I'm thinking of things to say but I'm not so great at that. Here's a really long piece of text that I hope makes for a good test."
 	classifier = language_classifier()
@@ -47,7 +58,146 @@ def test_classification_2():
 	return assertion(ans[0] == "Maori",
 		"test_classification_2 passed.",
 		"test_classification_2 failed: is Maori but was classified as " + fail_msg)
- 
+def test_match_probability_1():
+	matcher = maori_matcher()
+	words = ["korero", "whakapapa", "dragon", "a", "", "Aotearoa", "kōrero", "x"]
+	batch = matcher.match_probability(words)
+	single = [matcher.match_probability(word) for word in words]
+	claim = all([abs(b - s) < 0.00001 for b, s in zip(batch, single)]) and batch[4] == 0 and batch[0] > batch[2]
+	return assertion(claim,
+		"test_match_probability_1 passed.",
+		"test_match_probability_1 failed: batch scores " + str(batch) + " differed from single scores " + str(single))
+
+def test_match_probability_2():
+	matcher = maori_matcher()
+	words = ["korero", "whakapapa", "dragon", "a", "", "kōrero", "x", "aotearoa", "kiaora" * 20000, "hoa"]
+	batch = matcher.match_probability(words)
+	single = [matcher.match_probability(word) for word in words]
+	text = matcher.match_text_probability(" ".join(words), " ")
+	claim = all([abs(b - s) < 0.00001 for b, s in zip(batch, single)]) and text == 1.0 * len([p for p in single if p >= 0.5]) / len(words)
+	return assertion(claim,
+		"test_match_probability_2 passed.",
+		"test_match_probability_2 failed: batch scores " + str(batch) + " differed from single scores " + str(single))
+
+def test_partial_fit_1():
+	with open("../corpora/maori-corpus.txt", "r") as f:
+		corpus = [line.rstrip() for line in f]
+	whole = CorpusMatcher(0.5, trainingSet=corpus)
+	streamed = CorpusMatcher(0.5, trainingSet=corpus[:len(corpus)//2])
+	streamed.partial_fit(corpus[len(corpus)//2:])
+	words = ["korero", "whakapapa", "dragon", "a"]
+	claim = all([abs(a - b) < 0.00001 for a, b in zip(whole.match_probability(words), streamed.match_probability(words))])
+	return assertion(claim,
+		"test_partial_fit_1 passed.",
+		"test_partial_fit_1 failed: training in two parts gave different scores to training all at once")
+
+def test_merge_1():
+	with open("../corpora/maori-corpus.txt", "r") as f:
+		corpus = [line.rstrip() for line in f]
+	whole = CorpusMatcher(0.5, trainingSet=corpus)
+	merged = CorpusMatcher(0.5, trainingSet=corpus[::2])
+	merged.merge(CorpusMatcher(0.5, trainingSet=corpus[1::2] + ["xyz"]))
+	words = ["korero", "whakapapa", "dragon", "a"]
+	claim = all([abs(a - b) < 0.00001 for a, b in zip(whole.match_probability(words), merged.match_probability(words))]) and merged.counts()["x"]["y"] == 1
+	return assertion(claim,
+		"test_merge_1 passed.",
+		"test_merge_1 failed: merging two shards gave different scores to training all at once")
+
+def test_decay_1():
+	matcher = CorpusMatcher(0.5, trainingSet=["ab"], decay=0.5)
+	matcher.partial_fit(["ac"])
+	counts = matcher.counts()
+	claim = counts["a"]["b"] == 0.5 and counts["a"]["c"] == 1 and abs(matcher.match_probability("ac") - 2.0/3) < 0.00001
+	return assertion(claim,
+		"test_decay_1 passed.",
+		"test_decay_1 failed: expected decayed counts, got " + str(counts))
+
+def test_save_load_1():
+	import tempfile
+	matcher = maori_matcher()
+	matcher.invert()
+	path = os.path.join(tempfile.mkdtemp(), "maori.npz")
+	matcher.save(path)
+	loaded = CorpusMatcher.load(path)
+	loaded.partial_fit(["xyz"])
+	matcher.partial_fit(["xyz"])
+	words = ["korero", "whakapapa", "dragon", "a", "", "xyz"]
+	claim = matcher.match_probability(words) == loaded.match_probability(words) and loaded.is_inverted()
+	return assertion(claim,
+		"test_save_load_1 passed.",
+		"test_save_load_1 failed: loaded matcher scored differently to the one that was saved")
+
+def test_save_load_2():
+	import tempfile
+	text = "kia ora e hoa. ko hemi toku ingoa. Hey, how are you? My name is Aaron."
+	classifier = language_classifier()
+	path = os.path.join(tempfile.mkdtemp(), "classifier.npz")
+	classifier.save(path)
+	loaded = LanguageClassifier.load(path)
+	claim = classifier.classify_text(text, all_classifications=True) == loaded.classify_text(text, all_classifications=True)
+	return assertion(claim,
+		"test_save_load_2 passed.",
+		"test_save_load_2 failed: loaded classifier classified differently to the one that was saved")
+
+def test_markov_1():
+	with open("../corpora/maori-corpus.txt", "r") as f:
+		corpus = [line.rstrip() for line in f]
+	bigrams = CorpusMatcher(0.5, trainingSet=corpus)
+	markov = MarkovMatcher(0.5, trainingSet=corpus, order=2, memory=1<<24)
+	words = ["korero", "whakapapa", "dragon", "a", "", "Aotearoa", "kōrero", "x"]
+	claim = all([abs(a - b) < 0.00001 for a, b in zip(bigrams.match_probability(words), markov.match_probability(words))])
+	return assertion(claim,
+		"test_markov_1 passed.",
+		"test_markov_1 failed: an order 2 MarkovMatcher scored differently to a CorpusMatcher")
+
+def test_markov_3():
+	with open("../corpora/english-corpus.txt", "r") as f:
+		corpus = [line.rstrip() for line in f]
+	matcher = MarkovMatcher(0.5, trainingSet=corpus, order=4)
+	words = ["he", "wellington", "korero", "a", "", "the", "kōrero", "x"]
+	batch = matcher.match_probability(words)
+	single = [matcher.match_probability(word) for word in words]
+	claim = all([abs(b - s) < 0.00001 for b, s in zip(batch, single)]) and batch[1] > batch[6]
+	return assertion(claim,
+		"test_markov_3 passed.",
+		"test_markov_3 failed: batch scores " + str(batch) + " differed from single scores " + str(single))
+
+def test_markov_2():
+	import tempfile
+	with open("../corpora/maori-corpus.txt", "r") as f:
+		corpus = [line.rstrip() for line in f]
+	markov = MarkovMatcher(0.5, trainingSet=corpus, order=4, memory=1<<16)
+	classifier = LanguageClassifier({"English" : english_matcher(), "Maori" : markov})
+	path = os.path.join(tempfile.mkdtemp(), "classifier.npz")
+	classifier.save(path)
+	loaded = LanguageClassifier.load(path)
+	text = "kia ora e hoa. ko hemi toku ingoa. Hey, how are you? My name is Aaron."
+	claim = classifier.classify_text(text, all_classifications=True) == loaded.classify_text(text, all_classifications=True) and markov.__table__.nbytes <= 1<<16
+	return assertion(claim,
+		"test_markov_2 passed.",
+		"test_markov_2 failed: MarkovMatcher was larger than its memory budget, or didn't survive saving and loading")
+
+def test_cache_1():
+	matcher = CorpusMatcher(0.5, trainingSet=["ab", "bc"], cache=2)
+	first = matcher.match_probability(["ab", "ab", "bc"])
+	second = matcher.match_probability(["ab", "ca"])
+	stats = matcher.cache_stats()
+	claim = first == [1.0, 1.0, 1.0] and second == [1.0, 0.0] and stats["hits"] == 2 and stats["misses"] == 3 and stats["evictions"] == 1 and stats["size"] == 2
+	return assertion(claim,
+		"test_cache_1 passed.",
+		"test_cache_1 failed: unexpected cache stats " + str(stats))
+
+def test_cache_2():
+	matcher = CorpusMatcher(0.5, trainingSet=["ab"])
+	classifier = LanguageClassifier({"A" : matcher}, cache=16)
+	before = classifier.classify_words("ac", all_classifications=True)
+	matcher.partial_fit(["ac"])
+	after = classifier.classify_words("ac", all_classifications=True)
+	claim = before["A"] == 0.0 and after["A"] == 0.5 and classifier.cache_stats()["misses"] == 2
+	return assertion(claim,
+		"test_cache_2 passed.",
+		"test_cache_2 failed: cache wasn't emptied when the matcher was trained, scores were " + str(before) + " and " + str(after))
+
 def main():
 
 	tests = [obj for name,obj in inspect.getmembers(sys.modules[__name__]) if (inspect.isfunction(obj) and name.startswith("test"))]
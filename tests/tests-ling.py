@@ -87,6 +87,24 @@ def test_seq_align_02():
 		"Passed seq_align_2",
 		"Failed seq_align_1: got " + str(align) + " but should have been " + str(correct_ans))
 
+def test_seq_align_03():
+	s1 = "johnathon"
+	s2 = "jonathan"
+	align = alignment(s1, s2, linear_space=True)
+	correct_ans = alignment(s1, s2)
+	return assertion(align == correct_ans,
+		"Passed seq_align_3",
+		"Failed seq_align_3: got " + str(align) + " but should have been " + str(correct_ans))
+
+def test_seq_align_04():
+	s1 = "wellington" * 20
+	s2 = "welington" * 20
+	align = alignment(s1, s2, band=25)
+	correct_ans = alignment(s1, s2)
+	return assertion(align == correct_ans,
+		"Passed seq_align_4",
+		"Failed seq_align_4: banded alignment differed from the full alignment")
+
 def test_jaccard_01():
 	s1 = "ab"
 	s2 = "ab"
@@ -222,6 +240,32 @@ def test_ngram_10():
 		"Passed ngram_10",
 		"Failed ngram_10: for some reason")
 
+def test_ngram_11():
+	alphabet = get_ngram_alphabet("alpha", 2)
+	counts = ngram_counts(["andy", "warhol"], 2, "alpha")
+	ngram = ngram_frequency(["andy", "warhol"], 2)
+	claim = reduce(lambda x,y : x and y, [counts[i] == ngram.get(alphabet[i], 0) for i in range(len(alphabet))])
+	return assertion(claim,
+		"Passed ngram_11",
+		"Failed ngram_11: encoded n-gram counts didn't match ngram_frequency")
+
+def test_ngram_12():
+	ids = list(ngram_ids("ab-c", 2, "alpha"))
+	correct_ans = [1]
+	return assertion(ids == correct_ans,
+		"Passed ngram_12",
+		"Failed ngram_12: got " + str(ids) + " but should have been " + str(correct_ans))
+
+def test_ngram_13():
+	try:
+		ngram_ids("kia ora", 2, ["k", "ia", "ora"])
+		claim = False
+	except TypeError as e:
+		claim = "single characters" in str(e)
+	return assertion(claim,
+		"Passed ngram_13",
+		"Failed ngram_13: an alphabet with multi-character unigrams should be rejected")
+
 def test_smoothing_01():
 	alphabet = get_ngram_alphabet("alpha", 1)
 	s = "john"
@@ -251,6 +295,41 @@ def test_smoothing_03():
 		"Passed smoothing_03",
 		"Failed smoothing_03: some character has a non-positive probability")
 
+def test_alphabet_01():
+	alphabet = get_ngram_alphabet("alphanumeric", 4, lazy=True)
+	claim = len(alphabet) == 36**4 and "ab12" in alphabet and "AB12" not in alphabet and alphabet.ngram(alphabet.index("ab12")) == "ab12"
+	return assertion(claim,
+		"Passed alphabet_01",
+		"Failed alphabet_01: NgramAlphabet length, membership or indexing was wrong")
+
+def test_alphabet_02():
+	alphabet = get_ngram_alphabet("alpha", 2, lazy=True)
+	d1 = ngram_frequency("hello", 2, normed=True, smoothing=True, alphabet=alphabet)
+	d2 = ngram_frequency("hellion", 2, normed=True, smoothing=True, alphabet=alphabet)
+	listed = list(alphabet)
+	claim = accurate(kullback_leibler(d1, d2, alphabet), kullback_leibler(d1, d2, listed)) and accurate(bhattacharyya(d1, d2, alphabet), bhattacharyya(d1, d2, listed))
+	return assertion(claim,
+		"Passed alphabet_02",
+		"Failed alphabet_02: divergences over an NgramAlphabet didn't match divergences over the whole list")
+
+def test_alphabet_03():
+	alphabet = get_ngram_alphabet("alpha", 1)
+	distribution = ngram_frequency("john", 1, smoothing=True, alphabet=alphabet)
+	huge = get_ngram_alphabet("alphanumeric", 13, lazy=True)
+	claim = alphabet[0:3] == ["a", "b", "c"] and sum(distribution.values()) == 30 and huge.size == 36**13
+	return assertion(claim,
+		"Passed alphabet_03",
+		"Failed alphabet_03: get_ngram_alphabet should return a list unless asked to be lazy")
+
+def test_alphabet_04():
+	alphabet = get_ngram_alphabet("alphanumeric", 13, lazy=True)
+	distribution = ngram_frequency(["abcdefghijklmn", "0123456789abc"], 13, normed=True, smoothing=True, alphabet=alphabet)
+	small = get_ngram_alphabet("alpha", 2, lazy=True)
+	claim = alphabet.size > sys.maxsize and distribution["abcdefghijklm"] == 2 * distribution.default and small[:3] == ["aa", "ab", "ac"] and small[-2:] == ["zy", "zz"]
+	return assertion(claim,
+		"Passed alphabet_04",
+		"Failed alphabet_04: smoothing over, or slicing, an NgramAlphabet went wrong")
+
 def test_bhattacharyya_01():
 	alphabet = ["h","e","l","l","o","i","n"]
 	d1 = ngram_frequency("hello", 1, normed=True)
@@ -286,6 +365,77 @@ def test_bhattacharyya_04():
 		"Passed bhattacharyya_04",
 		"Failed bhattacharyya_04: distance should be 0.42826266... but it was " + str(bd))
 
+def test_levenshtein_many_01():
+	words = ["sitting", "kitten", "", "KITTEN"]
+	ans = list(levenshtein_many("kitten", words))
+	correct_ans = [levenshtein("kitten", word) for word in words]
+	return assertion(ans == correct_ans,
+		"Passed levenshtein_many_1",
+		"Failed levenshtein_many_1: got " + str(ans) + " but should have been " + str(correct_ans))
+
+def test_levenshtein_many_02():
+	words = ["ohm", "john", "JoHn", "jo"]
+	operations = { "insertion" : -5, "deletion" : -5, "skip" : 2, "transform" : -3 }
+	ans = list(edit_dist_many("john", words, operations, case_sensitive=True, minimise=False))
+	correct_ans = [edit_dist("john", word, operations, case_sensitive=True, minimise=False) for word in words]
+	return assertion(ans == correct_ans,
+		"Passed levenshtein_many_2",
+		"Failed levenshtein_many_2: got " + str(ans) + " but should have been " + str(correct_ans))
+
+def test_levenshtein_bounded_01():
+	ans = (levenshtein("kitten", "sitting", max_distance=3), levenshtein("kitten", "sitting", max_distance=2))
+	correct_ans = (3, 3)
+	return assertion(ans == correct_ans,
+		"Passed levenshtein_bounded_1",
+		"Failed levenshtein_bounded_1: got " + str(ans) + " but should have been " + str(correct_ans))
+
+def test_levenshtein_bounded_02():
+	ans = levenshtein("kitten", "sitting", transform=3, max_distance=10)
+	correct_ans = levenshtein("kitten", "sitting", transform=3)
+	return assertion(ans == correct_ans,
+		"Passed levenshtein_bounded_2",
+		"Failed levenshtein_bounded_2: got " + str(ans) + " but should have been " + str(correct_ans))
+
+def test_levenshtein_bounded_3():
+	pairs = [("kitten", "sitting"), ("wellington", "hamilton"), ("", "abc"), ("aotearoa", "aotearoa"), ("abcdef", "fedcba")]
+	claim = True
+	for a, b in pairs:
+		for k in range(0, 12):
+			exact = levenshtein(a, b, insertion=2, deletion=1, transform=3)
+			bounded = levenshtein(a, b, insertion=2, deletion=1, transform=3, max_distance=k)
+			claim = claim and bounded == (exact if exact <= k else k + 1)
+	return assertion(claim,
+		"Passed levenshtein_bounded_3",
+		"Failed levenshtein_bounded_3: banded distances with non-unit costs didn't match the full table")
+
+def test_divergence_matrix_01():
+	alphabet = get_ngram_alphabet("alpha", 2, lazy=True)
+	dists = [ngram_frequency(word, 2, normed=True, smoothing=True, alphabet=alphabet) for word in ["hello", "wellington", "aotearoa"]]
+	matrix = kullback_leibler_matrix(dists, dists, alphabet)
+	claim = reduce(lambda x,y : x and y, [accurate(matrix[i][j], kullback_leibler(dists[i], dists[j], alphabet)) for i in range(3) for j in range(3)])
+	return assertion(claim,
+		"Passed divergence_matrix_01",
+		"Failed divergence_matrix_01: KL matrix didn't match pairwise KL divergences")
+
+def test_divergence_matrix_02():
+	alphabet = set([char for char in "wellington"] + [char for char in "hamilton"])
+	d1 = ngram_frequency("wellington", 1, normed=True)
+	d2 = ngram_frequency("hamilton", 1, normed=True)
+	matrix = bhattacharyya_matrix([d1], [d1, d2], alphabet)
+	claim = accurate(matrix[0][0], 0) and accurate(matrix[0][1], 0.42826, 0.0001)
+	return assertion(claim,
+		"Passed divergence_matrix_02",
+		"Failed divergence_matrix_02: got " + str(matrix))
+
+def test_kullback_leibler_distance_01():
+	alphabet = get_ngram_alphabet("alpha", 1)
+	d1 = ngram_frequency("hello", 1, normed=True, smoothing=True, alphabet=alphabet)
+	d2 = ngram_frequency("hamilton", 1, normed=True, smoothing=True, alphabet=alphabet)
+	claim = accurate(kullback_leibler_distance(d1, d2, alphabet), kullback_leibler_distance(d2, d1, alphabet))
+	return assertion(claim,
+		"Passed kullback_leibler_distance_01",
+		"Failed kullback_leibler_distance_01: KLD(p,q) should be equal to KLD(q,p)")
+
 def main():
 	print("=================")
 	print("Running tests....")
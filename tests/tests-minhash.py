@@ -0,0 +1,67 @@
+import inspect
+import sys
+import os
+
+here = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.normpath(os.path.join(here, "../src")))
+
+from minhash import *
+from ling import jaccard, ngram_set
+
+def assertion(assertion, correct_msg, failure_msg):
+	if assertion:
+		print(correct_msg)
+		return True
+	else:
+		print(failure_msg)
+		return False
+
+def test_signature_1():
+	s1 = minhash_signature(ngram_set("wellington", 2))
+	s2 = minhash_signature(ngram_set("wellingtons", 2))
+	estimate = (s1 == s2).mean()
+	actual = jaccard("wellington", "wellingtons")
+	return assertion(abs(estimate - actual) < 0.15,
+		"Passed signature_1",
+		"Failed signature_1: estimated " + str(estimate) + " but the Jaccard index was " + str(actual))
+
+def test_query_1():
+	index = MinHashIndex(0.5)
+	for word in ["wellington", "wellingtons", "hamilton", "auckland", "whanganui"]:
+		index.add(word)
+	matches = [match[0] for match in index.query("welington")]
+	return assertion("wellington" in matches and "auckland" not in matches,
+		"Passed query_1",
+		"Failed query_1: got " + str(matches))
+
+def test_all_pairs_1():
+	index = MinHashIndex(0.5)
+	for word in ["wellington", "wellingtons", "hamilton", "auckland", "whanganui"]:
+		index.add(word)
+	pairs = index.all_pairs()
+	correct_ans = [("wellington", "wellingtons", jaccard("wellington", "wellingtons"))]
+	return assertion(pairs == correct_ans,
+		"Passed all_pairs_1",
+		"Failed all_pairs_1: got " + str(pairs) + " but should have been " + str(correct_ans))
+
+def main():
+
+	tests = [obj for name,obj in inspect.getmembers(sys.modules[__name__]) if (inspect.isfunction(obj) and name.startswith("test"))]
+	sortkey = lambda x : str(x)
+	tests.sort(key=sortkey)
+	print("=================")
+	print(len(tests), "tests.")
+	print("Running tests....")
+	print()
+	count = 0
+	for test in tests:
+		if test():
+			count = count + 1
+	pct = 1.0 * count / len(tests) * 100
+	print()
+	print("Finished.")
+	print("Passed: " + str(count) + "/" + str(len(tests)) + " ("+str(pct)+"%)")
+	print("================")
+	
+if __name__ == "__main__":
+	main()
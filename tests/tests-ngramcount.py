@@ -0,0 +1,90 @@
+import inspect
+import sys
+import os
+
+here = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.normpath(os.path.join(here, "../src")))
+
+from ngramcount import *
+from ling import ngram_frequency, get_ngram_alphabet
+
+def assertion(assertion, correct_msg, failure_msg):
+	if assertion:
+		print(correct_msg)
+		return True
+	else:
+		print(failure_msg)
+		return False
+
+def test_count_files_1():
+	path = os.path.join(here, "../corpora/maori-corpus.txt")
+	with open(path, "r") as f:
+		words = [line.strip() for line in f]
+	counter = NgramCounter(2)
+	counter.count_files(path, workers=2, chunk_size=4096)
+	correct_ans = ngram_frequency(words, 2)
+	return assertion(counter.frequencies() == correct_ans,
+		"Passed count_files_1",
+		"Failed count_files_1: counts differed from ngram_frequency")
+
+def test_merge_1():
+	c1 = NgramCounter(2)
+	c1.update(["andy"])
+	c2 = NgramCounter(2)
+	c2.update(["warhol", "andy"])
+	c1.merge(c2)
+	claim = c1["an"] == 2 and c1["nd"] == 2 and c1["wa"] == 1 and len(c1) == 8
+	return assertion(claim,
+		"Passed merge_1",
+		"Failed merge_1: merged counts were " + str(c1.counts))
+
+def test_update_1():
+	counter = NgramCounter(2)
+	counter.update(["kia ora", "e hoa"])
+	correct_ans = ngram_frequency(["kia ora", "e hoa"], 2)
+	return assertion(counter.frequencies() == correct_ans,
+		"Passed update_1",
+		"Failed update_1: got " + str(counter.counts) + " but should have been " + str(correct_ans))
+
+def test_frequencies_1():
+	counter = NgramCounter(13)
+	counter.update(["abcdefghijklmn"])
+	alphabet = get_ngram_alphabet("alphanumeric", 13, lazy=True)
+	distribution = counter.frequencies(normed=True, smoothing=True, alphabet=alphabet)
+	claim = alphabet.size > sys.maxsize and distribution["abcdefghijklm"] == 2 * distribution.default
+	return assertion(claim,
+		"Passed frequencies_1",
+		"Failed frequencies_1: smoothing over a huge NgramAlphabet went wrong")
+
+def test_save_1():
+	counter = NgramCounter(1)
+	counter.update(["kia", "ora"])
+	path = os.path.join(here, "ngramcount-test.json")
+	counter.save(path)
+	loaded = NgramCounter.load(path)
+	os.remove(path)
+	return assertion(loaded.counts == counter.counts and loaded.degree == 1,
+		"Passed save_1",
+		"Failed save_1: loaded counter was " + str(loaded.counts))
+
+def main():
+
+	tests = [obj for name,obj in inspect.getmembers(sys.modules[__name__]) if (inspect.isfunction(obj) and name.startswith("test"))]
+	sortkey = lambda x : str(x)
+	tests.sort(key=sortkey)
+	print("=================")
+	print(len(tests), "tests.")
+	print("Running tests....")
+	print()
+	count = 0
+	for test in tests:
+		if test():
+			count = count + 1
+	pct = 1.0 * count / len(tests) * 100
+	print()
+	print("Finished.")
+	print("Passed: " + str(count) + "/" + str(len(tests)) + " ("+str(pct)+"%)")
+	print("================")
+	
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,70 @@
+import inspect
+import sys
+import os
+
+here = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.normpath(os.path.join(here, "../src")))
+
+from pairwise import *
+from ling import levenshtein, jaccard
+
+def assertion(assertion, correct_msg, failure_msg):
+	if assertion:
+		print(correct_msg)
+		return True
+	else:
+		print(failure_msg)
+		return False
+
+__words__ = ["wellington", "welly", "hamilton", "kirikiriroa", "te whanganui-a-tara"]
+
+def test_pairwise_1():
+	distances = list(pairwise(__words__, "levenshtein", workers=2, block_rows=2))
+	correct_ans = [levenshtein(__words__[i], __words__[j]) for i in range(len(__words__)) for j in range(i+1, len(__words__))]
+	return assertion(distances == correct_ans,
+		"Passed pairwise_1",
+		"Failed pairwise_1: got " + str(distances) + " but should have been " + str(correct_ans))
+
+def test_pairwise_2():
+	distances = list(pairwise(__words__, jaccard, workers=1, ngram_degree=1))
+	correct_ans = [jaccard(__words__[i], __words__[j], 1) for i in range(len(__words__)) for j in range(i+1, len(__words__))]
+	return assertion(distances == correct_ans,
+		"Passed pairwise_2",
+		"Failed pairwise_2: got " + str(distances) + " but should have been " + str(correct_ans))
+
+def test_pairwise_3():
+	distances = list(pairwise(__words__, "levenshtein", workers=1, max_distance=2))
+	correct_ans = [levenshtein(__words__[i], __words__[j], max_distance=2) for i in range(len(__words__)) for j in range(i+1, len(__words__))]
+	return assertion(distances == correct_ans,
+		"Passed pairwise_3",
+		"Failed pairwise_3: got " + str(distances) + " but should have been " + str(correct_ans))
+
+def test_pairwise_blocks_1():
+	blocks = [block for block in pairwise_blocks(__words__, "seq_align", workers=1, block_rows=2)]
+	ranges = [(start, stop) for start, stop, values in blocks]
+	sizes = sum([len(values) for start, stop, values in blocks])
+	return assertion(ranges == [(0, 2), (2, 4), (4, 5)] and sizes == 10,
+		"Passed pairwise_blocks_1",
+		"Failed pairwise_blocks_1: got blocks " + str(ranges))
+
+def main():
+
+	tests = [obj for name,obj in inspect.getmembers(sys.modules[__name__]) if (inspect.isfunction(obj) and name.startswith("test"))]
+	sortkey = lambda x : str(x)
+	tests.sort(key=sortkey)
+	print("=================")
+	print(len(tests), "tests.")
+	print("Running tests....")
+	print()
+	count = 0
+	for test in tests:
+		if test():
+			count = count + 1
+	pct = 1.0 * count / len(tests) * 100
+	print()
+	print("Finished.")
+	print("Passed: " + str(count) + "/" + str(len(tests)) + " ("+str(pct)+"%)")
+	print("================")
+	
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,196 @@
+import inspect
+import sys
+import os
+
+here = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.normpath(os.path.join(here, "../src")))
+
+from trie import *
+
+def assertion(assertion, correct_msg, failure_msg):
+	if assertion:
+		print(correct_msg)
+		return True
+	else:
+		print(failure_msg)
+		return False
+
+__words__ = ["hello", "help", "he", "hell", "world", "word", "kia", "kiore", "kōrero"]
+
+def test_iter_1():
+	words = ["kōrero", "word", "apple", "he", "world", "help", "ant", "hello"]
+	ans = list(Trie(words))
+	correct_ans = sorted(words)
+	return assertion(ans == correct_ans,
+		"Passed iter_1",
+		"Failed iter_1: iterated " + str(ans) + " but should have been " + str(correct_ans))
+
+def test_frozen_1():
+	trie = Trie(__words__)
+	frozen = trie.freeze()
+	claim = list(frozen) == list(trie) and len(frozen) == len(trie)
+	return assertion(claim,
+		"Passed frozen_1",
+		"Failed frozen_1: iterated " + str(list(frozen)) + " but should have been " + str(list(trie)))
+
+def test_frozen_2():
+	frozen = FrozenTrie(__words__)
+	words = __words__ + ["hel", "words", "", "kō", "kōrero!"]
+	ans = [word in frozen for word in words]
+	correct_ans = [word in __words__ for word in words]
+	return assertion(ans == correct_ans,
+		"Passed frozen_2",
+		"Failed frozen_2: membership was " + str(ans) + " but should have been " + str(correct_ans))
+
+def test_dawg_1():
+	trie = Trie(__words__)
+	dawg = trie.dawg()
+	claim = list(dawg) == list(trie) and len(dawg) == len(trie) and DAWG(__words__).nodes() == dawg.nodes()
+	return assertion(claim,
+		"Passed dawg_1",
+		"Failed dawg_1: iterated " + str(list(dawg)) + " but should have been " + str(list(trie)))
+
+def test_dawg_2():
+	dawg = DAWG(["tapping", "taping", "tap", "tape", "capping"])
+	words = ["tapping", "taping", "tap", "tape", "capping", "caping", "cap", "tapin", ""]
+	ans = [word in dawg for word in words]
+	correct_ans = [True, True, True, True, True, False, False, False, False]
+	return assertion(ans == correct_ans and dawg.nodes() < len(FrozenTrie(words[:5]).terminal),
+		"Passed dawg_2",
+		"Failed dawg_2: membership was " + str(ans) + " but should have been " + str(correct_ans))
+
+def test_substr_1():
+	trie = Trie(["kia", "ora", "whanau"])
+	claim = trie.contains_substr_of("www.kiaora.co.nz") and not trie.contains_substr_of("www.example.com")
+	return assertion(claim,
+		"Passed substr_1",
+		"Failed substr_1: contains_substr_of gave the wrong answer")
+
+def test_substr_2():
+	trie = Trie(["he", "she", "his", "hers"])
+	ans = list(trie.find_substrs("ushers"))
+	correct_ans = [(1, "she"), (2, "he"), (2, "hers")]
+	return assertion(ans == correct_ans,
+		"Passed substr_2",
+		"Failed substr_2: got " + str(ans) + " but should have been " + str(correct_ans))
+
+def test_prefix_1():
+	trie = Trie(__words__)
+	ans = list(trie.iter_prefix("hel"))
+	correct_ans = ["hell", "hello", "help"]
+	return assertion(ans == correct_ans,
+		"Passed prefix_1",
+		"Failed prefix_1: got " + str(ans) + " but should have been " + str(correct_ans))
+
+def test_prefix_2():
+	trie = Trie(__words__)
+	trie.add("he")
+	trie.add("helping")
+	ans = [trie.count_prefix(prefix) for prefix in ["", "he", "help", "wor", "x"]]
+	correct_ans = [10, 5, 2, 2, 0]
+	return assertion(ans == correct_ans,
+		"Passed prefix_2",
+		"Failed prefix_2: got " + str(ans) + " but should have been " + str(correct_ans))
+
+def test_fuzzy_1():
+	trie = Trie(__words__)
+	ans = trie.fuzzy("helo", 1)
+	correct_ans = [("hell", 1), ("hello", 1), ("help", 1)]
+	return assertion(ans == correct_ans,
+		"Passed fuzzy_1",
+		"Failed fuzzy_1: got " + str(ans) + " but should have been " + str(correct_ans))
+
+def test_fuzzy_2():
+	trie = Trie(__words__)
+	ans = trie.fuzzy("wrod", 2)
+	correct_ans = [("word", 2), ("world", 2)]
+	return assertion(ans == correct_ans and trie.fuzzy("xyzzy", 1) == [],
+		"Passed fuzzy_2",
+		"Failed fuzzy_2: got " + str(ans) + " but should have been " + str(correct_ans))
+
+def test_mmap_1():
+	frozen = FrozenTrie(__words__)
+	path = os.path.join(here, "trie-test.bin")
+	frozen.save(path)
+	loaded = FrozenTrie.load(path)
+	claim = list(loaded) == list(frozen) and len(loaded) == len(frozen) and "kōrero" in loaded and "kōr" not in loaded
+	claim = claim and list(loaded.iter_prefix("wor")) == ["word", "world"]
+	loaded = None
+	os.remove(path)
+	return assertion(claim,
+		"Passed mmap_1",
+		"Failed mmap_1: memory-mapped FrozenTrie had different contents")
+
+def test_persistent_1():
+	old = PersistentTrie(__words__)
+	new = old.add("helping")
+	claim = "helping" in new and "helping" not in old and len(new) == len(old) + 1 and old.add("help") is old
+	claim = claim and list(old) == sorted(__words__) and new.count_prefix("help") == 2 and old.count_prefix("help") == 1
+	return assertion(claim,
+		"Passed persistent_1",
+		"Failed persistent_1: adding to a PersistentTrie changed the old version or missed the new word")
+
+def test_persistent_2():
+	old = PersistentTrie(__words__)
+	new = old.update(["kiwi", "kia", "kākā"])
+	claim = list(new.iter_prefix("k")) == ["kia", "kiore", "kiwi", "kākā", "kōrero"] and new.head.kids["w"] is old.head.kids["w"]
+	return assertion(claim,
+		"Passed persistent_2",
+		"Failed persistent_2: got " + str(list(new.iter_prefix("k"))))
+
+def test_contains_many_1():
+	trie = Trie(__words__)
+	words = ["world", "hel", "help", "zebra", "he", "helps", "", "help", "kōrero"]
+	ans = list(trie.contains_many(words))
+	correct_ans = [word in trie for word in words]
+	return assertion(ans == correct_ans,
+		"Passed contains_many_1",
+		"Failed contains_many_1: got " + str(ans) + " but should have been " + str(correct_ans))
+
+def test_prefixes_of_1():
+	trie = Trie(__words__)
+	ans = (trie.prefixes_of("hellothere"), trie.longest_prefix_of("hellothere"), trie.longest_prefix_of("kiaora"), trie.longest_prefix_of("xyz"))
+	correct_ans = (["he", "hell", "hello"], "hello", "kia", None)
+	return assertion(ans == correct_ans,
+		"Passed prefixes_of_1",
+		"Failed prefixes_of_1: got " + str(ans) + " but should have been " + str(correct_ans))
+
+def test_complete_1():
+	trie = Trie({ "kia" : 50, "kiore" : 5, "kiwi" : 30, "kōrero" : 40, "kite" : 30 }, leaders=3)
+	ans = (trie.complete("k", 3), trie.complete("ki", 5))
+	correct_ans = ([("kia", 50), ("kōrero", 40), ("kite", 30)], [("kia", 50), ("kite", 30), ("kiwi", 30), ("kiore", 5)])
+	return assertion(ans == correct_ans,
+		"Passed complete_1",
+		"Failed complete_1: got " + str(ans) + " but should have been " + str(correct_ans))
+
+def test_complete_2():
+	trie = Trie({ "kia" : 50, "kiore" : 5, "kiwi" : 30, "kōrero" : 40, "kite" : 30 }, leaders=2)
+	trie.add("kia", 1)
+	trie.add("kiore", 100)
+	ans = (trie.complete("ki", 2), trie.weight("kia"))
+	correct_ans = ([("kiore", 100), ("kite", 30)], 1)
+	return assertion(ans == correct_ans,
+		"Passed complete_2",
+		"Failed complete_2: got " + str(ans) + " but should have been " + str(correct_ans))
+
+def main():
+
+	tests = [obj for name,obj in inspect.getmembers(sys.modules[__name__]) if (inspect.isfunction(obj) and name.startswith("test"))]
+	sortkey = lambda x : str(x)
+	tests.sort(key=sortkey)
+	print("=================")
+	print(len(tests), "tests.")
+	print("Running tests....")
+	print()
+	count = 0
+	for test in tests:
+		if test():
+			count = count + 1
+	pct = 1.0 * count / len(tests) * 100
+	print()
+	print("Finished.")
+	print("Passed: " + str(count) + "/" + str(len(tests)) + " ("+str(pct)+"%)")
+	print("================")
+	
+if __name__ == "__main__":
+	main()